@@ -0,0 +1,54 @@
+from logging.config import fileConfig
+from sqlalchemy import engine_from_config, pool
+from alembic import context
+from app.core.config import settings
+from app.core.database import Base, get_sync_database_url
+from app.models.user import User
+from app.models.project import Project
+from app.models.dashboard_counter import DashboardCounter
+from app.models.user_signup_rollup import UserSignupRollup
+from app.models.activity import Activity
+
+config = context.config
+# The app's DATABASE_URL wins over the placeholder in alembic.ini
+config.set_main_option("sqlalchemy.url", get_sync_database_url(settings.DATABASE_URL))
+
+if config.config_file_name is not None:
+    # Keep uvicorn's loggers alive when migrations run inside the app
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    # Callers that already hold a connection (tests) pass it in directly
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
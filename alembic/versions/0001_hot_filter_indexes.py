@@ -0,0 +1,38 @@
+"""Indexes for hot filters: projects.status, projects(owner_id, created_at), users.created_at
+
+Tables predate Alembic (init_db.py creates them with create_all), so this
+first revision only adds the indexes. if_not_exists keeps it safe on
+databases where create_all already built them from the models.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_projects_status", "projects", ["status"], if_not_exists=True)
+    op.create_index(
+        "ix_projects_owner_id_created_at",
+        "projects",
+        ["owner_id", "created_at"],
+        if_not_exists=True,
+    )
+    op.create_index("ix_users_created_at", "users", ["created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at", table_name="users")
+    op.drop_index("ix_projects_owner_id_created_at", table_name="projects")
+    op.drop_index("ix_projects_status", table_name="projects")
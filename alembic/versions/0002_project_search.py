@@ -0,0 +1,75 @@
+"""Full-text search over projects.name / projects.description
+
+Postgres gets a GIN index on the to_tsvector expression used by
+app/core/search.py; SQLite gets an external-content FTS5 table kept in
+sync by triggers.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        name, description,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO projects_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_projects_search ON projects USING gin ("
+            "to_tsvector('simple'::regconfig, "
+            "(coalesce(name, '') || ' ') || coalesce(description, '')))"
+        )
+    elif dialect_name == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_projects_search")
+    elif dialect_name == "sqlite":
+        for trigger in ("projects_fts_ai", "projects_fts_ad", "projects_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS projects_fts")
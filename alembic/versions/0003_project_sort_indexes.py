@@ -0,0 +1,33 @@
+"""Indexes for project date-range filters and sorts: projects(created_at, id), projects(name, id)
+
+created_from/created_to and sort=created_at / sort=name on GET /api/projects/
+otherwise scan the table and sort in a temp B-tree. id is the tie-breaker
+the router appends to every ORDER BY, so it is part of both indexes.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_projects_created_at_id", "projects", ["created_at", "id"], if_not_exists=True
+    )
+    op.create_index("ix_projects_name_id", "projects", ["name", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_name_id", table_name="projects")
+    op.drop_index("ix_projects_created_at_id", table_name="projects")
@@ -1,22 +1,25 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from app.api.deps import get_current_user
 from app.core import security
+from app.core.activity import activity_log
 from app.core.config import settings
+from app.core.counters import USERS_COUNTER, USERS_VERSION, bump_counters
 from app.core.database import get_db
+from app.core.timing import TimedRoute
 from app.models.user import User
 from app.schemas.user import User as UserSchema, Token, UserCreate
 
-router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/register", response_model=UserSchema)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # SQLAlchemy 2.0 style query
     stmt = select(User).where(User.email == user_data.email)
-    db_user = db.execute(stmt).scalar_one_or_none()
+    db_user = (await db.execute(stmt)).scalar_one_or_none()
     
     if db_user:
         raise HTTPException(
@@ -25,7 +28,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create user
-    hashed_password = security.get_password_hash(user_data.password)
+    hashed_password = await security.get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -33,30 +36,51 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await bump_counters(db, {USERS_COUNTER: 1, USERS_VERSION: 1})
+    await db.commit()
+    await db.refresh(db_user)
+    activity_log.record("user.registered", "user", db_user.id, db_user.full_name, actor=db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # SQLAlchemy 2.0 style query
     stmt = select(User).where(User.email == form_data.username)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = (await db.execute(stmt)).scalar_one_or_none()
     # return {"access_token": user.hashed_password, "token_type": "bearer"}
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    if user:
+        verified, new_hash = await security.verify_and_update_password_async(
+            form_data.password, user.hashed_password
+        )
+    if not user or not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently rehash when BCRYPT_ROUNDS changed since this hash was made.
+    # The hash is not part of the user's representation, so updated_at (and
+    # with it ETags and If-Match preconditions) is left as it was
+    if new_hash:
+        await db.execute(
+            update(User).where(User.id == user.id)
+            .values(hashed_password=new_hash, updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
         subject=user.email, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/me", response_model=UserSchema)
+async def read_current_user(current_user: UserSchema = Depends(get_current_user)):
+    return current_user
@@ -1,72 +1,143 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from datetime import datetime, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.activity import activity_log
+from app.core.broadcast import SnapshotBroadcaster
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.counters import PROJECTS_VERSION, USERS_COUNTER, USERS_VERSION, read_counters
 from app.core.database import get_db
-from app.models.user import User
-from app.models.project import Project
+from app.core.etag import conditional_etag
+from app.core.rollups import add_buckets, as_utc, bucket_floor, bucket_label, get_signup_series
+from app.core.timing import TimedRoute
 from app.schemas.dashboard import DashboardData, DashboardMetrics, ChartData
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.get("/metrics", response_model=DashboardData)
-async def get_dashboard_metrics(db: Session = Depends(get_db)):
-    # SQLAlchemy 2.0 queries
-    total_users_stmt = select(func.count(User.id))
-    total_users = db.execute(total_users_stmt).scalar()
-    
-    active_projects_stmt = select(func.count(Project.id)).where(Project.status == "active")
-    active_projects = db.execute(active_projects_stmt).scalar()
+PROJECT_STATUSES = ("active", "completed", "paused")
+
+MAX_GROWTH_BUCKETS = 400
+
+metrics_cache = TTLCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+# Growth windows default to "now", so the representation also rolls over
+# daily; the feed head covers events synced in from other workers. Versions
+# come from the same-TTL snapshot, so a poll answered from metrics_cache (or
+# with 304) does not touch the database.
+dashboard_etag = conditional_etag(
+    USERS_VERSION, PROJECTS_VERSION,
+    extra=lambda: (datetime.now(timezone.utc).date(), activity_log.head()),
+    cached=True,
+)
+
+async def get_dashboard_counts(db: AsyncSession) -> dict:
+    """User total plus project counts per status from dashboard_counters"""
+    counters = await read_counters(db)
     
-    completed_projects_stmt = select(func.count(Project.id)).where(Project.status == "completed")
-    completed_projects = db.execute(completed_projects_stmt).scalar()
+    total_users = counters.pop(USERS_COUNTER, 0)
+    project_status = {status: 0 for status in PROJECT_STATUSES}
+    project_status.update({
+        name.split(":", 1)[1]: value
+        for name, value in counters.items()
+        if name.startswith("projects:")
+    })
+    return {"total_users": total_users, "project_status": project_status}
+
+async def build_user_growth(
+    db: AsyncSession,
+    bucket: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> ChartData:
+    end = end or datetime.now(timezone.utc)
+    start = start or add_buckets(bucket_floor(end, bucket), bucket, -5)
+    series = await get_signup_series(db, bucket, start, end)
+    return ChartData(
+        labels=[bucket_label(bucket_start, bucket) for bucket_start, _ in series],
+        data=[signups for _, signups in series]
+    )
+
+async def build_dashboard_data(db: AsyncSession) -> DashboardData:
+    counts = await get_dashboard_counts(db)
+    total_users = counts["total_users"]
+    project_status = counts["project_status"]
     
     # Metrics
     metrics = DashboardMetrics(
-        total_users=total_users or 42,
-        active_projects=active_projects or 15,
-        completed_projects=completed_projects or 28,
+        total_users=total_users,
+        active_projects=project_status["active"],
+        completed_projects=project_status["completed"],
         monthly_revenue=48750.50
     )
     
-    # Mock chart data
-    user_growth = ChartData(
-        labels=["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-        data=[10, 15, 22, 28, 35, total_users or 42]
-    )
-    
-    project_status = {
-        "active": active_projects or 15,
-        "completed": completed_projects or 28,
-        "paused": 3
-    }
+    # Signups over the last six months
+    user_growth = await build_user_growth(db, "month")
     
-    recent_activities = [
-        {
-            "id": 1,
-            "user": "Rafael García",
-            "action": "Created new project",
-            "project": "ERP Module",
-            "time": "2 hours ago"
-        },
-        {
-            "id": 2,
-            "user": "Ana López",
-            "action": "Completed task",
-            "project": "Dashboard UI",
-            "time": "4 hours ago"
-        },
-        {
-            "id": 3,
-            "user": "Carlos Ruiz",
-            "action": "Updated user profile",
-            "project": "User Management",
-            "time": "6 hours ago"
-        }
-    ]
+    # Latest events from the in-memory feed; no query
+    recent_activities = activity_log.feed()
     
     return DashboardData(
         metrics=metrics,
         user_growth=user_growth,
         project_status=project_status,
         recent_activities=recent_activities
-    )
\ No newline at end of file
+    )
+
+async def dashboard_state_key(db: AsyncSession) -> tuple:
+    # Same inputs as dashboard_etag: table versions, the day, the feed head
+    versions = await read_counters(db, (USERS_VERSION, PROJECTS_VERSION))
+    return (
+        versions.get(USERS_VERSION, 0),
+        versions.get(PROJECTS_VERSION, 0),
+        datetime.now(timezone.utc).date(),
+        activity_log.head(),
+    )
+
+async def dashboard_snapshot(db: AsyncSession) -> str:
+    return (await build_dashboard_data(db)).model_dump_json()
+
+dashboard_stream = SnapshotBroadcaster("metrics", dashboard_state_key, dashboard_snapshot)
+# Every user/project write records an activity event after its commit
+activity_log.add_listener(lambda event: dashboard_stream.wake())
+
+@router.get("/metrics", response_model=DashboardData)
+async def get_dashboard_metrics(
+    cache_headers: dict = Depends(dashboard_etag),
+    db: AsyncSession = Depends(get_db)
+):
+    # Cached per ETag: at most one aggregate query per TTL window, and a
+    # write moves readers to a fresh entry instead of a stale one
+    return await metrics_cache.get_or_set(
+        ("metrics", cache_headers["ETag"]), lambda: build_dashboard_data(db)
+    )
+
+@router.get("/user-growth", response_model=ChartData, dependencies=[Depends(dashboard_etag)])
+async def get_user_growth(
+    bucket: Literal["day", "week", "month"] = "month",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    # Defaults to the last six buckets ending now
+    end = as_utc(end) if end else datetime.now(timezone.utc)
+    start = as_utc(start) if start else None
+    if start and start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if start and add_buckets(bucket_floor(start, bucket), bucket, MAX_GROWTH_BUCKETS) <= end:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range exceeds {MAX_GROWTH_BUCKETS} {bucket} buckets"
+        )
+    return await build_user_growth(db, bucket, start, end)
+
+@router.get("/stream")
+async def stream_dashboard_metrics():
+    # Server-Sent Events: one "metrics" event (same payload as /metrics) on
+    # connect and after every change, computed once for all viewers
+    return StreamingResponse(
+        dashboard_stream.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,75 @@
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.counters import USERS_VERSION, read_counters_cached
+from app.core.database import get_db
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+# token -> (users version, UserSchema), tagged with the user id; skips
+# signature verification and the users SELECT for tokens seen recently by
+# this worker. An entry is only used while the users version it was cached
+# under is current, so writes made by other workers (which can't reach this
+# cache) take effect within DASHBOARD_CACHE_TTL_SECONDS.
+token_cache = LRUCache(maxsize=settings.AUTH_CACHE_SIZE)
+
+def invalidate_user(user_id: int) -> None:
+    """Drop this worker's cached tokens for a user after it is updated or deleted"""
+    token_cache.invalidate_tag(user_id)
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> UserSchema:
+    # Read before the user row, so a write in between only costs a refresh
+    users_version = (await read_counters_cached(db, [USERS_VERSION])).get(USERS_VERSION, 0)
+    cached = token_cache.get(token)
+    if cached is not None and cached[0] == users_version:
+        return cached[1]
+    
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    email = claims.get("sub")
+    if email is None:
+        raise credentials_exception
+    
+    stmt = select(User).where(User.email == email)
+    user = (await db.execute(stmt)).scalar_one_or_none()
+    if user is None:
+        raise credentials_exception
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    
+    current_user = UserSchema.model_validate(user)
+    expires_at = min(claims.get("exp", 0), time.time() + settings.AUTH_CACHE_TTL_SECONDS)
+    token_cache.set(token, (users_version, current_user), expires_at, tag=current_user.id)
+    return current_user
+
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Optional[UserSchema]:
+    """Current user when a valid token is sent, otherwise None (used to
+    attribute activity on endpoints that do not require auth)"""
+    if token is None:
+        return None
+    try:
+        return await get_current_user(token, db)
+    except HTTPException:
+        return None
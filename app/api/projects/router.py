@@ -1,56 +1,383 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from app.core.database import get_db
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.orm import joinedload
+from app.api.deps import get_optional_user
+from app.core.activity import activity_log
+from app.core.bulk import apply_in_chunks, read_bulk_body, validate_items
+from app.core.counters import PROJECTS_VERSION, USERS_VERSION, bump_counters, project_status_counter
+from app.core.database import async_engine, get_db
+from app.core.etag import (
+    conditional_etag, conditional_resource, if_match_conditions, raise_write_miss, resource_etag
+)
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import decode_id_cursor, encode_cursor
+from app.core.search import project_search_condition
+from app.core.serialization import (
+    fast_json_response, model_json_response, parse_fields, reject_projection_with_include,
+    rows_as_dicts, schema_columns,
+)
+from app.core.timing import TimedRoute
 from app.models.project import Project
-from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from app.schemas.bulk import BulkDeleteItem, BulkItemError, BulkResult
+from app.schemas.includes import ProjectWithOwner, ProjectWithOwnerPage
+from app.schemas.user import User as UserSchema
+from app.schemas.project import (
+    Project as ProjectSchema, ProjectBulkUpdate, ProjectCreate, ProjectUpdate, ProjectPage
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.get("/", response_model=List[ProjectSchema])
-async def get_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    stmt = select(Project).offset(skip).limit(limit)
-    projects = db.execute(stmt).scalars().all()
-    return projects
+SORT_COLUMNS = {
+    "id": Project.id,
+    "created_at": Project.created_at,
+    "name": Project.name,
+}
+ProjectSort = Literal["id", "-id", "created_at", "-created_at", "name", "-name"]
+
+# include=owner joins the owner into the same SELECT instead of one lazy
+# load per project
+ProjectInclude = Literal["owner"]
+INCLUDE_OPTIONS = {"owner": joinedload(Project.owner)}
+INCLUDE_VERSIONS = {"owner": USERS_VERSION}
+
+projects_etag = conditional_etag(PROJECTS_VERSION, include_versions=INCLUDE_VERSIONS)
+
+PROJECT_COLUMNS = tuple(Project.__table__.columns)
+
+def project_filters(
+    dialect_name: str,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    q: Optional[str] = None,
+) -> list:
+    conditions = []
+    if status is not None:
+        conditions.append(Project.status == status)
+    if priority is not None:
+        conditions.append(Project.priority == priority)
+    if owner_id is not None:
+        conditions.append(Project.owner_id == owner_id)
+    if created_from is not None:
+        conditions.append(Project.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(Project.created_at < created_to)
+    if q and q.strip():
+        conditions.append(project_search_condition(dialect_name, q))
+    return conditions
+
+def project_order_by(sort: str) -> list:
+    descending = sort.startswith("-")
+    sort_column = SORT_COLUMNS[sort.lstrip("-")]
+    order_by = [sort_column.desc() if descending else sort_column]
+    if sort_column is not Project.id:
+        order_by.append(Project.id.desc() if descending else Project.id)
+    return order_by
+
+@router.get("/", response_model=Union[ProjectPage, List[ProjectSchema]])
+async def get_projects(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    q: Optional[str] = None,
+    sort: ProjectSort = "id",
+    fast: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[ProjectInclude] = None,
+    cache_headers: dict = Depends(projects_etag),
+    db: AsyncSession = Depends(get_db)
+):
+    # fast=true or fields=a,b select plain columns and encode with orjson;
+    # without fields the JSON shape is the same as the ORM path
+    selected = parse_fields(fields, ProjectSchema)
+    projected = fast or selected is not None
+    reject_projection_with_include(projected, include)
+    entities = schema_columns(Project, ProjectSchema, selected, required=("id",)) if projected else [Project]
+    options = [INCLUDE_OPTIONS[include]] if include else []
+    conditions = project_filters(
+        db.bind.dialect.name, status, priority, owner_id, created_from, created_to, q
+    )
+    descending = sort.startswith("-")
+    order_by = project_order_by(sort)
+    
+    # Keyset pagination when a cursor is given (empty for the first page);
+    # plain skip/limit is kept for existing clients
+    if cursor is None:
+        stmt = (
+            select(*entities).options(*options)
+            .where(*conditions).order_by(*order_by).offset(skip).limit(limit)
+        )
+        result = await db.execute(stmt)
+        if projected:
+            return fast_json_response(rows_as_dicts(result.all(), selected), cache_headers)
+        if include:
+            return model_json_response(List[ProjectWithOwner], result.scalars().all(), cache_headers)
+        return result.scalars().all()
+    
+    if sort.lstrip("-") != "id":
+        raise HTTPException(status_code=400, detail="Cursor pagination supports sort=id or sort=-id")
+    limit = max(limit, 1)
+    after_id = decode_id_cursor(cursor)
+    stmt = select(*entities).options(*options).where(*conditions).order_by(*order_by).limit(limit + 1)
+    if after_id is not None:
+        stmt = stmt.where(Project.id < after_id if descending else Project.id > after_id)
+    result = await db.execute(stmt)
+    projects = result.all() if projected else result.scalars().all()
+    
+    next_cursor = encode_cursor({"id": projects[limit - 1].id}) if len(projects) > limit else None
+    if projected:
+        return fast_json_response({"items": rows_as_dicts(projects[:limit], selected), "next_cursor": next_cursor}, cache_headers)
+    if include:
+        return model_json_response(
+            ProjectWithOwnerPage, {"items": projects[:limit], "next_cursor": next_cursor}, cache_headers
+        )
+    return ProjectPage(items=projects[:limit], next_cursor=next_cursor)
 
 @router.post("/", response_model=ProjectSchema)
-async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(
+    project: ProjectCreate,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
     db_project = Project(**project.model_dump())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await bump_counters(db, {project_status_counter(db_project.status): 1, PROJECTS_VERSION: 1})
+    await db.commit()
+    await db.refresh(db_project)
+    activity_log.record("project.created", "project", db_project.id, db_project.name, actor=actor)
     return db_project
 
+@router.get("/export")
+async def export_projects(
+    format: ExportFormat = "ndjson",
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    q: Optional[str] = None,
+):
+    # Same filters as the listing, streamed from a server-side cursor
+    conditions = project_filters(
+        async_engine.dialect.name, status, priority, owner_id, created_from, created_to, q
+    )
+    stmt = select(*Project.__table__.columns).where(*conditions).order_by(Project.id)
+    return export_response(stmt, format, "projects")
+
+# Bulk endpoints take a JSON array or NDJSON (application/x-ndjson) body
+async def _create_project_chunk(db: AsyncSession, chunk):
+    rows = [item.model_dump() for _, item in chunk]
+    stmt = insert(Project).returning(Project.id, sort_by_parameter_order=True)
+    ids = list((await db.execute(stmt, rows)).scalars())
+    deltas = Counter(project_status_counter(row["status"]) for row in rows)
+    deltas[PROJECTS_VERSION] = 1
+    await bump_counters(db, deltas)
+    return ids, []
+
+async def _update_project_chunk(db: AsyncSession, chunk):
+    ids = {item.id for _, item in chunk}
+    stmt = select(Project.id, Project.status).where(Project.id.in_(ids)).with_for_update()
+    statuses = dict((await db.execute(stmt)).all())
+    
+    rows, updated, errors = [], [], []
+    deltas = Counter()
+    # Set here like update_project, so the new ETags round-trip through If-Match
+    now = datetime.now(timezone.utc)
+    for index, item in chunk:
+        if item.id not in statuses:
+            errors.append(BulkItemError(index=index, id=item.id, error="Project not found"))
+            continue
+        values = item.model_dump(exclude_unset=True)
+        values["updated_at"] = now
+        if "status" in values and values["status"] != statuses[item.id]:
+            deltas[project_status_counter(statuses[item.id])] -= 1
+            deltas[project_status_counter(values["status"])] += 1
+            statuses[item.id] = values["status"]
+        if values.keys() - {"id", "updated_at"}:
+            rows.append(values)
+        updated.append(item.id)
+    
+    if rows:
+        # ORM bulk UPDATE by primary key (executemany)
+        await db.execute(update(Project), rows)
+        deltas[PROJECTS_VERSION] = 1
+    await bump_counters(db, deltas)
+    return updated, errors
+
+async def _delete_project_chunk(db: AsyncSession, chunk):
+    ids = {item.id for _, item in chunk}
+    stmt = delete(Project).where(Project.id.in_(ids)).returning(Project.id, Project.status)
+    deleted = dict((await db.execute(stmt)).all())
+    
+    removed, errors = [], []
+    for index, item in chunk:
+        if item.id in deleted and item.id not in removed:
+            removed.append(item.id)
+        else:
+            errors.append(BulkItemError(index=index, id=item.id, error="Project not found"))
+    deltas = Counter()
+    for status in deleted.values():
+        deltas[project_status_counter(status)] -= 1
+    deltas[PROJECTS_VERSION] = 1 if deleted else 0
+    await bump_counters(db, deltas)
+    return removed, errors
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_projects(
+    request: Request,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    raw_items = await read_bulk_body(request)
+    items, errors = validate_items(raw_items, ProjectCreate)
+    result = await apply_in_chunks(db, items, _create_project_chunk, errors, len(raw_items))
+    if result.succeeded:
+        activity_log.record(
+            "projects.bulk_created", "project", subject_name=f"{result.succeeded} projects", actor=actor
+        )
+    return result
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_update_projects(
+    request: Request,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    raw_items = await read_bulk_body(request)
+    items, errors = validate_items(raw_items, ProjectBulkUpdate)
+    result = await apply_in_chunks(db, items, _update_project_chunk, errors, len(raw_items))
+    if result.succeeded:
+        activity_log.record(
+            "projects.bulk_updated", "project", subject_name=f"{result.succeeded} projects", actor=actor
+        )
+    return result
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_projects(
+    request: Request,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    raw_items = await read_bulk_body(request)
+    items, errors = validate_items(raw_items, BulkDeleteItem)
+    result = await apply_in_chunks(db, items, _delete_project_chunk, errors, len(raw_items))
+    if result.succeeded:
+        activity_log.record(
+            "projects.bulk_deleted", "project", subject_name=f"{result.succeeded} projects", actor=actor
+        )
+    return result
+
 @router.get("/{project_id}", response_model=ProjectSchema)
-async def get_project(project_id: int, db: Session = Depends(get_db)):
-    stmt = select(Project).where(Project.id == project_id)
-    project = db.execute(stmt).scalar_one_or_none()
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    include: Optional[ProjectInclude] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    selected = parse_fields(fields, ProjectSchema)
+    reject_projection_with_include(selected is not None, include)
+    if selected is None:
+        options = [INCLUDE_OPTIONS[include]] if include else []
+        stmt = select(Project).options(*options).where(Project.id == project_id)
+        project = (await db.execute(stmt)).scalar_one_or_none()
+    else:
+        columns = schema_columns(Project, ProjectSchema, selected, required=("updated_at",))
+        project = (await db.execute(select(*columns).where(Project.id == project_id))).one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    # Per-resource ETag, which If-Match on PUT/DELETE accepts back
+    versions = [INCLUDE_VERSIONS[include]] if include else []
+    cache_headers = await conditional_resource(request, response, db, project.updated_at, versions)
+    if selected is not None:
+        return fast_json_response(rows_as_dicts([project], selected)[0], cache_headers)
+    if include:
+        return model_json_response(ProjectWithOwner, project, cache_headers)
     return project
 
 @router.put("/{project_id}", response_model=ProjectSchema)
-async def update_project(project_id: int, project_update: ProjectUpdate, db: Session = Depends(get_db)):
-    stmt = select(Project).where(Project.id == project_id)
-    project = db.execute(stmt).scalar_one_or_none()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+async def update_project(
+    project_id: int,
+    project_update: ProjectUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and refresh;
+    # updated_at is set here so If-Match sees the exact stored value
+    values = project_update.model_dump(exclude_unset=True)
+    values["updated_at"] = datetime.now(timezone.utc)
+    conditions = [Project.id == project_id, *if_match_conditions(Project.updated_at, if_match)]
+    stmt = update(Project).values(values).execution_options(synchronize_session=False)
     
-    for field, value in project_update.model_dump(exclude_unset=True).items():
-        setattr(project, field, value)
+    # A status change moves the project between status counters, so the
+    # previous status is needed too
+    old_status = None
+    if "status" in values and db.bind.dialect.name == "postgresql":
+        # Locked self-join returns it from the same statement
+        previous = (
+            select(Project.id, Project.status).where(Project.id == project_id)
+            .with_for_update().subquery("previous")
+        )
+        stmt = stmt.where(Project.id == previous.c.id).returning(
+            previous.c.status.label("old_status"), *PROJECT_COLUMNS
+        )
+    else:
+        if "status" in values:
+            # SQLite can't RETURNING from an UPDATE ... FROM table; read it
+            # first (SQLite has no row locks, as before)
+            old_status = (await db.execute(
+                select(Project.status).where(Project.id == project_id)
+            )).scalar()
+        stmt = stmt.returning(*PROJECT_COLUMNS)
     
-    db.commit()
-    db.refresh(project)
+    project = (await db.execute(stmt.where(*conditions))).one_or_none()
+    if project is None:
+        await raise_write_miss(db, Project.id, project_id, if_match, "Project not found")
+    
+    deltas = {PROJECTS_VERSION: 1}
+    if "status" in values:
+        old_status = getattr(project, "old_status", old_status)
+        if project.status != old_status:
+            deltas[project_status_counter(old_status)] = -1
+            deltas[project_status_counter(project.status)] = 1
+    await bump_counters(db, deltas)
+    await db.commit()
+    activity_log.record("project.updated", "project", project.id, project.name, actor=actor)
+    response.headers["ETag"] = resource_etag(project.updated_at)
     return project
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: int, db: Session = Depends(get_db)):
-    stmt = select(Project).where(Project.id == project_id)
-    project = db.execute(stmt).scalar_one_or_none()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+async def delete_project(
+    project_id: int,
+    if_match: Optional[str] = Header(None),
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    stmt = (
+        delete(Project)
+        .where(Project.id == project_id, *if_match_conditions(Project.updated_at, if_match))
+        .returning(Project.name, Project.status)
+        .execution_options(synchronize_session=False)
+    )
+    project = (await db.execute(stmt)).one_or_none()
+    if project is None:
+        await raise_write_miss(db, Project.id, project_id, if_match, "Project not found")
     
-    db.delete(project)
-    db.commit()
+    await bump_counters(db, {project_status_counter(project.status): -1, PROJECTS_VERSION: 1})
+    await db.commit()
+    activity_log.record("project.deleted", "project", project_id, project.name, actor=actor)
     return {"message": "Project deleted successfully"}
\ No newline at end of file
@@ -1,48 +1,304 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.orm import selectinload
+from app.api.deps import get_optional_user, invalidate_user
+from app.core import security
+from app.core.activity import activity_log
+from app.core.bulk import apply_in_chunks, read_bulk_body, validate_items
+from app.core.counters import PROJECTS_VERSION, USERS_COUNTER, USERS_VERSION, bump_counters
 from app.core.database import get_db
+from app.core.etag import (
+    conditional_etag, conditional_resource, if_match_conditions, raise_write_miss, resource_etag
+)
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import decode_id_cursor, encode_cursor
+from app.core.serialization import (
+    fast_json_response, model_json_response, parse_fields, reject_projection_with_include,
+    rows_as_dicts, schema_columns,
+)
+from app.core.timing import TimedRoute
+from app.models.project import Project
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.schemas.bulk import BulkDeleteItem, BulkItemError, BulkResult
+from app.schemas.includes import UserWithProjects, UserWithProjectsPage
+from app.schemas.user import (
+    User as UserSchema, UserBulkUpdate, UserCreate, UserUpdate, UserPage
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.get("/", response_model=List[UserSchema])
-async def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    stmt = select(User).offset(skip).limit(limit)
-    users = db.execute(stmt).scalars().all()
-    return users
+# include=projects loads every listed user's projects with one extra
+# SELECT ... WHERE owner_id IN (...) instead of one lazy load per user
+UserInclude = Literal["projects"]
+INCLUDE_OPTIONS = {"projects": selectinload(User.projects)}
+INCLUDE_VERSIONS = {"projects": PROJECTS_VERSION}
+
+users_etag = conditional_etag(USERS_VERSION, include_versions=INCLUDE_VERSIONS)
+
+# Columns returned by UPDATE ... RETURNING (no password hash)
+USER_COLUMNS = tuple(getattr(User, name) for name in UserSchema.model_fields)
+
+def user_page_statement(entities, options, after_id: Optional[int], limit: int):
+    stmt = select(*entities).options(*options).order_by(User.id).limit(limit)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    return stmt
+
+@router.get("/", response_model=Union[UserPage, List[UserSchema]])
+async def get_users(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fast: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[UserInclude] = None,
+    cache_headers: dict = Depends(users_etag),
+    db: AsyncSession = Depends(get_db)
+):
+    # fast=true or fields=a,b select plain columns and encode with orjson;
+    # without fields the JSON shape is the same as the ORM path
+    selected = parse_fields(fields, UserSchema)
+    projected = fast or selected is not None
+    reject_projection_with_include(projected, include)
+    entities = schema_columns(User, UserSchema, selected, required=("id",)) if projected else [User]
+    options = [INCLUDE_OPTIONS[include]] if include else []
+    
+    # Keyset pagination when a cursor is given (empty for the first page);
+    # plain skip/limit is kept for existing clients
+    if cursor is None:
+        stmt = select(*entities).options(*options).offset(skip).limit(limit)
+        result = await db.execute(stmt)
+        if projected:
+            return fast_json_response(rows_as_dicts(result.all(), selected), cache_headers)
+        if include:
+            return model_json_response(List[UserWithProjects], result.scalars().all(), cache_headers)
+        return result.scalars().all()
+    
+    limit = max(limit, 1)
+    after_id = decode_id_cursor(cursor)
+    stmt = user_page_statement(entities, options, after_id, limit + 1)
+    result = await db.execute(stmt)
+    users = result.all() if projected else result.scalars().all()
+    
+    next_cursor = encode_cursor({"id": users[limit - 1].id}) if len(users) > limit else None
+    if projected:
+        return fast_json_response({"items": rows_as_dicts(users[:limit], selected), "next_cursor": next_cursor}, cache_headers)
+    if include:
+        return model_json_response(
+            UserWithProjectsPage, {"items": users[:limit], "next_cursor": next_cursor}, cache_headers
+        )
+    return UserPage(items=users[:limit], next_cursor=next_cursor)
+
+@router.get("/export")
+async def export_users(format: ExportFormat = "ndjson"):
+    # Streams every user (without password hashes) from a server-side cursor
+    stmt = select(
+        User.id, User.email, User.username, User.full_name,
+        User.is_active, User.is_admin, User.created_at, User.updated_at,
+    ).order_by(User.id)
+    return export_response(stmt, format, "users")
+
+# Bulk endpoints take a JSON array or NDJSON (application/x-ndjson) body
+async def _hash_user_chunk(chunk):
+    # Hash one chunk at a time, outside its write transaction, so each chunk
+    # is stored before the next one is hashed; the bcrypt pool bounds concurrency
+    hashes = await asyncio.gather(
+        *(security.get_password_hash_async(item.password) for _, item in chunk)
+    )
+    return [
+        (index, {**item.model_dump(exclude={"password"}), "hashed_password": hashed_password})
+        for (index, item), hashed_password in zip(chunk, hashes)
+    ]
+
+async def _create_user_chunk(db: AsyncSession, chunk):
+    rows = [item for _, item in chunk]
+    stmt = insert(User).returning(User.id, sort_by_parameter_order=True)
+    ids = list((await db.execute(stmt, rows)).scalars())
+    await bump_counters(db, {USERS_COUNTER: len(ids), USERS_VERSION: 1})
+    return ids, []
+
+async def _update_user_chunk(db: AsyncSession, chunk):
+    ids = {item.id for _, item in chunk}
+    existing = set((await db.execute(select(User.id).where(User.id.in_(ids)))).scalars())
+    
+    rows, updated, errors = [], [], []
+    # Set here like update_user, so the new ETags round-trip through If-Match
+    now = datetime.now(timezone.utc)
+    for index, item in chunk:
+        if item.id not in existing:
+            errors.append(BulkItemError(index=index, id=item.id, error="User not found"))
+            continue
+        values = item.model_dump(exclude_unset=True)
+        values["updated_at"] = now
+        if values.keys() - {"id", "updated_at"}:
+            rows.append(values)
+        updated.append(item.id)
+    
+    if rows:
+        # ORM bulk UPDATE by primary key (executemany)
+        await db.execute(update(User), rows)
+        await bump_counters(db, {USERS_VERSION: 1})
+    return updated, errors
+
+async def _delete_user_chunk(db: AsyncSession, chunk):
+    ids = {item.id for _, item in chunk}
+    # Unassign their projects first, as delete_user does, so the FK holds
+    unassigned = await db.execute(
+        update(Project).where(Project.owner_id.in_(ids)).values(owner_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    stmt = delete(User).where(User.id.in_(ids)).returning(User.id)
+    deleted = set((await db.execute(stmt)).scalars())
+    
+    removed, errors = [], []
+    for index, item in chunk:
+        if item.id in deleted and item.id not in removed:
+            removed.append(item.id)
+        else:
+            errors.append(BulkItemError(index=index, id=item.id, error="User not found"))
+    await bump_counters(db, {
+        USERS_COUNTER: -len(deleted),
+        USERS_VERSION: 1 if deleted else 0,
+        PROJECTS_VERSION: 1 if unassigned.rowcount else 0,
+    })
+    return removed, errors
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_users(
+    request: Request,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    raw_items = await read_bulk_body(request)
+    items, errors = validate_items(raw_items, UserCreate)
+    result = await apply_in_chunks(
+        db, items, _create_user_chunk, errors, len(raw_items), prepare_chunk=_hash_user_chunk
+    )
+    if result.succeeded:
+        activity_log.record("users.bulk_created", "user", subject_name=f"{result.succeeded} users", actor=actor)
+    return result
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_update_users(
+    request: Request,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    raw_items = await read_bulk_body(request)
+    items, errors = validate_items(raw_items, UserBulkUpdate)
+    result = await apply_in_chunks(db, items, _update_user_chunk, errors, len(raw_items))
+    for user_id in result.ids:
+        invalidate_user(user_id)
+    if result.succeeded:
+        activity_log.record("users.bulk_updated", "user", subject_name=f"{result.succeeded} users", actor=actor)
+    return result
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_users(
+    request: Request,
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    raw_items = await read_bulk_body(request)
+    items, errors = validate_items(raw_items, BulkDeleteItem)
+    result = await apply_in_chunks(db, items, _delete_user_chunk, errors, len(raw_items))
+    for user_id in result.ids:
+        invalidate_user(user_id)
+    if result.succeeded:
+        activity_log.record("users.bulk_deleted", "user", subject_name=f"{result.succeeded} users", actor=actor)
+    return result
 
 @router.get("/{user_id}", response_model=UserSchema)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
-    stmt = select(User).where(User.id == user_id)
-    user = db.execute(stmt).scalar_one_or_none()
+async def get_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    include: Optional[UserInclude] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    selected = parse_fields(fields, UserSchema)
+    reject_projection_with_include(selected is not None, include)
+    if selected is None:
+        options = [INCLUDE_OPTIONS[include]] if include else []
+        stmt = select(User).options(*options).where(User.id == user_id)
+        user = (await db.execute(stmt)).scalar_one_or_none()
+    else:
+        columns = schema_columns(User, UserSchema, selected, required=("updated_at",))
+        user = (await db.execute(select(*columns).where(User.id == user_id))).one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    # Per-resource ETag, which If-Match on PUT/DELETE accepts back
+    versions = [INCLUDE_VERSIONS[include]] if include else []
+    cache_headers = await conditional_resource(request, response, db, user.updated_at, versions)
+    if selected is not None:
+        return fast_json_response(rows_as_dicts([user], selected)[0], cache_headers)
+    if include:
+        return model_json_response(UserWithProjects, user, cache_headers)
     return user
 
 @router.put("/{user_id}", response_model=UserSchema)
-async def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get_db)):
-    stmt = select(User).where(User.id == user_id)
-    user = db.execute(stmt).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    for field, value in user_update.model_dump(exclude_unset=True).items():
-        setattr(user, field, value)
+async def update_user(
+    user_id: int,
+    user_update: UserUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and refresh;
+    # updated_at is set here so If-Match sees the exact stored value
+    values = user_update.model_dump(exclude_unset=True)
+    values["updated_at"] = datetime.now(timezone.utc)
+    stmt = (
+        update(User)
+        .where(User.id == user_id, *if_match_conditions(User.updated_at, if_match))
+        .values(values)
+        .returning(*USER_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    user = (await db.execute(stmt)).one_or_none()
+    if user is None:
+        await raise_write_miss(db, User.id, user_id, if_match, "User not found")
     
-    db.commit()
-    db.refresh(user)
+    await bump_counters(db, {USERS_VERSION: 1})
+    await db.commit()
+    invalidate_user(user.id)
+    activity_log.record("user.updated", "user", user.id, user.full_name, actor=actor)
+    response.headers["ETag"] = resource_etag(user.updated_at)
     return user
 
 @router.delete("/{user_id}")
-async def delete_user(user_id: int, db: Session = Depends(get_db)):
-    stmt = select(User).where(User.id == user_id)
-    user = db.execute(stmt).scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+async def delete_user(
+    user_id: int,
+    if_match: Optional[str] = Header(None),
+    actor: Optional[UserSchema] = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Their projects are kept and unassigned, as the ORM delete used to do
+    # (after loading them); rolled back below if the user isn't deleted
+    unassigned = await db.execute(
+        update(Project).where(Project.owner_id == user_id).values(owner_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    stmt = (
+        delete(User)
+        .where(User.id == user_id, *if_match_conditions(User.updated_at, if_match))
+        .returning(User.full_name)
+        .execution_options(synchronize_session=False)
+    )
+    user = (await db.execute(stmt)).one_or_none()
+    if user is None:
+        await raise_write_miss(db, User.id, user_id, if_match, "User not found")
     
-    db.delete(user)
-    db.commit()
+    await bump_counters(db, {
+        USERS_COUNTER: -1, USERS_VERSION: 1, PROJECTS_VERSION: 1 if unassigned.rowcount else 0
+    })
+    await db.commit()
+    invalidate_user(user_id)
+    activity_log.record("user.deleted", "user", user_id, user.full_name, actor=actor)
     return {"message": "User deleted successfully"}
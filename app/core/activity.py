@@ -0,0 +1,210 @@
+"""Activity feed: buffered, batched audit log plus an in-memory ring buffer.
+
+Handlers call ``activity_log.record(...)`` after their commit. The event goes
+into the ring buffer that serves the dashboard feed and onto a bounded queue;
+a background task drains the queue into ``activities`` with multi-row
+INSERTs, so requests never wait on audit writes. On startup the buffer is
+rebuilt from the newest rows. With several workers each one also pulls rows
+written by the others every ACTIVITY_SYNC_INTERVAL_SECONDS.
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from sqlalchemy import insert, select
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.rollups import as_utc
+from app.models.activity import Activity
+
+logger = logging.getLogger("smartadmin.activity")
+
+ACTION_LABELS = {
+    "user.registered": "Registered",
+    "user.updated": "Updated user profile",
+    "user.deleted": "Deleted user",
+    "users.bulk_created": "Bulk created users",
+    "users.bulk_updated": "Bulk updated users",
+    "users.bulk_deleted": "Bulk deleted users",
+    "project.created": "Created new project",
+    "project.updated": "Updated project",
+    "project.deleted": "Deleted project",
+    "projects.bulk_created": "Bulk created projects",
+    "projects.bulk_updated": "Bulk updated projects",
+    "projects.bulk_deleted": "Bulk deleted projects",
+}
+
+@dataclass
+class ActivityEvent:
+    event_id: str
+    created_at: datetime
+    action: str
+    subject_type: str
+    subject_id: Optional[int] = None
+    subject_name: Optional[str] = None
+    actor_id: Optional[int] = None
+    actor_name: Optional[str] = None
+
+class ActivityLog:
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ACTIVITY_QUEUE_SIZE)
+        self._buffer: List[ActivityEvent] = []
+        self._last_synced_id = 0
+        self._tasks: List[asyncio.Task] = []
+        self._listeners: List[Callable[[ActivityEvent], None]] = []
+
+    def add_listener(self, listener: Callable[[ActivityEvent], None]) -> None:
+        """Called synchronously for every recorded event; must not block"""
+        self._listeners.append(listener)
+
+    def record(
+        self,
+        action: str,
+        subject_type: str,
+        subject_id: Optional[int] = None,
+        subject_name: Optional[str] = None,
+        actor: Any = None,
+    ) -> None:
+        """Non-blocking; ``actor`` is a User/UserSchema or None (anonymous)"""
+        event = ActivityEvent(
+            event_id=uuid.uuid4().hex,
+            created_at=datetime.now(timezone.utc),
+            action=action,
+            subject_type=subject_type,
+            subject_id=subject_id,
+            subject_name=subject_name,
+            actor_id=getattr(actor, "id", None),
+            actor_name=getattr(actor, "full_name", None),
+        )
+        self._merge([event])
+        for listener in self._listeners:
+            listener(event)
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            metrics.activity_events_dropped.inc()
+            logger.warning("Activity queue full, dropped %s", action)
+            return
+        metrics.activity_queue_depth.inc()
+
+    def head(self) -> Optional[str]:
+        """Newest event id in this worker's buffer (changes whenever the feed does)"""
+        return self._buffer[-1].event_id if self._buffer else None
+
+    def feed(self) -> List[Dict[str, Any]]:
+        """Newest first; ``created_at`` is absolute so a cached feed never goes stale
+        (the client renders "5 minutes ago")"""
+        return [
+            {
+                "id": event.event_id,
+                "user": event.actor_name or "Anonymous",
+                "action": ACTION_LABELS.get(event.action, event.action),
+                "project": event.subject_name if event.subject_type == "project" else "User Management",
+                "subject_type": event.subject_type,
+                "subject_id": event.subject_id,
+                "created_at": event.created_at.isoformat(),
+            }
+            for event in reversed(self._buffer)
+        ]
+
+    def _merge(self, events: Iterable[ActivityEvent]) -> None:
+        seen = {event.event_id for event in self._buffer}
+        fresh = [event for event in events if event.event_id not in seen]
+        if fresh:
+            merged = sorted(self._buffer + fresh, key=lambda event: event.created_at)
+            self._buffer = merged[-settings.ACTIVITY_FEED_SIZE:]
+
+    async def _load_newest(self) -> None:
+        stmt = (
+            select(Activity)
+            .where(Activity.id > self._last_synced_id)
+            .order_by(Activity.id.desc())
+            .limit(settings.ACTIVITY_FEED_SIZE)
+        )
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(stmt)).scalars().all()
+        if rows:
+            self._last_synced_id = max(self._last_synced_id, rows[0].id)
+            self._merge(
+                ActivityEvent(
+                    event_id=row.event_id,
+                    created_at=as_utc(row.created_at),
+                    action=row.action,
+                    subject_type=row.subject_type,
+                    subject_id=row.subject_id,
+                    subject_name=row.subject_name,
+                    actor_id=row.actor_id,
+                    actor_name=row.actor_name,
+                )
+                for row in rows
+            )
+
+    async def start(self) -> None:
+        # A fresh queue bound to this event loop, keeping anything recorded
+        # before startup
+        pending, self._queue = self._queue, asyncio.Queue(maxsize=settings.ACTIVITY_QUEUE_SIZE)
+        while not pending.empty():
+            self._queue.put_nowait(pending.get_nowait())
+        try:
+            await self._load_newest()
+        except Exception as e:
+            # Missing table before init_db; the feed starts empty
+            logger.warning("Could not rebuild activity feed: %s", e)
+        self._tasks = [asyncio.create_task(self._writer())]
+        if settings.ACTIVITY_SYNC_INTERVAL_SECONDS > 0:
+            self._tasks.append(asyncio.create_task(self._syncer()))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush queued events, then stop the background tasks"""
+        if not self._tasks:
+            return
+        writer, *others = self._tasks
+        for task in others:
+            task.cancel()
+        # None tells the writer to flush what it has and exit
+        await self._queue.put(None)
+        try:
+            await asyncio.wait_for(writer, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Activity writer did not finish in %.0fs", timeout)
+        self._tasks = []
+
+    async def _writer(self) -> None:
+        batch_size = settings.ACTIVITY_BATCH_SIZE
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < batch_size:
+                # Let a batch accumulate unless one is already waiting
+                await asyncio.sleep(settings.ACTIVITY_FLUSH_INTERVAL_SECONDS)
+            while len(batch) < batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            stopping = None in batch
+            events = [event for event in batch if event is not None]
+            if events:
+                await self._write(events)
+            if stopping and self._queue.empty():
+                return
+
+    async def _write(self, events: List[ActivityEvent]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(Activity).values([asdict(event) for event in events]))
+                await db.commit()
+        except Exception:
+            metrics.activity_events_dropped.inc(len(events))
+            logger.exception("Failed to write %d activity events", len(events))
+        finally:
+            metrics.activity_queue_depth.dec(len(events))
+
+    async def _syncer(self) -> None:
+        while True:
+            await asyncio.sleep(settings.ACTIVITY_SYNC_INTERVAL_SECONDS)
+            try:
+                await self._load_newest()
+            except Exception:
+                logger.exception("Activity feed sync failed")
+
+activity_log = ActivityLog()
@@ -0,0 +1,114 @@
+"""One-time database bootstrap (init, seed, counters) for app startup.
+
+An already bootstrapped database is recognised with one query (Alembic's
+revision plus the counters written last), so a restart does no schema or seed
+work and never imports the init scripts or Alembic.
+
+Otherwise several processes may start at once (gunicorn workers, or
+replicas), so the bootstrap runs under a cross-process lock: a Postgres
+advisory lock, or a file lock next to the database for SQLite. Every step is
+idempotent, and processes that waited re-check the marker first.
+"""
+import fcntl
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.core.counters import USERS_COUNTER
+from app.core.database import engine
+from app.core.metrics import startup_seconds
+
+logger = logging.getLogger("smartadmin.bootstrap")
+
+# Arbitrary application-wide key for pg_advisory_lock
+BOOTSTRAP_LOCK_KEY = 0x534D4144  # "SMAD"
+
+# Set by the gunicorn master once it has bootstrapped; workers inherit it
+BOOTSTRAPPED_ENV = "SMARTADMIN_DB_BOOTSTRAPPED"
+
+# Alembic head (alembic/versions); bump with every new migration
+# (tests/test_bootstrap.py fails until it is). If it lags, the full bootstrap
+# runs on every start and logs a warning.
+SCHEMA_REVISION = "0003"
+
+# reconcile_counters writes the users counter after init and seed succeeded
+_MARKER_QUERY = text(
+    "SELECT (SELECT version_num FROM alembic_version) AS revision, "
+    "EXISTS (SELECT 1 FROM dashboard_counters WHERE name = :counter) AS counted"
+)
+
+def is_bootstrapped() -> bool:
+    try:
+        with engine.connect() as connection:
+            marker = connection.execute(_MARKER_QUERY, {"counter": USERS_COUNTER}).one()
+    except DBAPIError:
+        # Fresh database: the tables don't exist yet
+        return False
+    return marker.revision == SCHEMA_REVISION and bool(marker.counted)
+
+@contextmanager
+def bootstrap_lock():
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        return
+
+    database = engine.url.database
+    if database and database != ":memory:":
+        lock_path = os.path.abspath(database) + ".bootstrap.lock"
+    else:
+        lock_path = os.path.join(tempfile.gettempdir(), "smartadmin.bootstrap.lock")
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def bootstrap_database() -> bool:
+    """init_db + seed_data + reconcile_counters, once per schema revision"""
+    if os.getenv(BOOTSTRAPPED_ENV):
+        return True
+
+    started = time.perf_counter()
+    try:
+        if is_bootstrapped():
+            return True
+        with bootstrap_lock():
+            # Another process may have finished while we waited
+            if is_bootstrapped():
+                return True
+            return _run_bootstrap()
+    finally:
+        elapsed = time.perf_counter() - started
+        startup_seconds.labels("bootstrap").set(elapsed)
+        print(f"🗄️  Database bootstrap check took {elapsed * 1000:.0f} ms")
+
+def _run_bootstrap() -> bool:
+    # Imported only when there is work to do; they pull in Alembic and bcrypt
+    from init_db import init_db
+    from seed_data import seed_data
+    from reconcile_counters import reconcile_counters
+
+    if not init_db():
+        return False
+    seed_data()
+    reconcile_counters()
+
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    head = ScriptDirectory.from_config(Config("alembic.ini")).get_current_head()
+    if head != SCHEMA_REVISION:
+        logger.warning(
+            "SCHEMA_REVISION is %s but the migration head is %s; startup will "
+            "bootstrap every time until app/core/bootstrap.py is updated",
+            SCHEMA_REVISION, head,
+        )
+    return True
@@ -0,0 +1,116 @@
+"""Fan-out of one computed snapshot to many Server-Sent Events clients.
+
+A single publisher task per worker (running only while someone listens)
+recomputes the snapshot when its state key changes, encodes it once, and
+puts the same bytes on every subscriber's bounded queue. Local writes wake
+the publisher immediately; writes made by other workers are picked up by
+polling the state key. A subscriber whose queue is full is dropped rather
+than buffered; EventSource clients reconnect on their own.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Hashable, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger("smartadmin.broadcast")
+
+# Client reconnect delay sent with the first message
+RETRY_MILLISECONDS = 3000
+
+class _Subscriber:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.dropped = False
+
+class SnapshotBroadcaster:
+    def __init__(
+        self,
+        event: str,
+        state_key: Callable[[AsyncSession], Awaitable[Hashable]],
+        snapshot: Callable[[AsyncSession], Awaitable[str]],
+    ):
+        self.event = event
+        self._state_key = state_key
+        self._snapshot = snapshot
+        self._subscribers: Set[_Subscriber] = set()
+        self._publisher: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._last_key: Hashable = None
+        self._latest: Optional[bytes] = None
+
+    def wake(self) -> None:
+        """Ask the publisher to re-check now (e.g. right after a local write)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """SSE body for one client"""
+        subscriber = _Subscriber(settings.DASHBOARD_STREAM_CLIENT_QUEUE)
+        self._subscribers.add(subscriber)
+        metrics.sse_subscribers.inc()
+        running = self._ensure_publisher()
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+            if running and self._latest is not None:
+                yield self._latest
+            while not subscriber.dropped:
+                try:
+                    payload = await asyncio.wait_for(
+                        subscriber.queue.get(), settings.DASHBOARD_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield b": keep-alive\n\n"
+                    continue
+                yield payload
+        finally:
+            self._subscribers.discard(subscriber)
+            metrics.sse_subscribers.dec()
+            if not self._subscribers and self._publisher is not None:
+                # Let it finish any query in flight and exit on its own
+                self._publisher = None
+                self.wake()
+
+    def _ensure_publisher(self) -> bool:
+        """Start the publisher if needed; True if it was already running"""
+        if self._publisher is not None and not self._publisher.done():
+            return True
+        self._wake = asyncio.Event()
+        # Publish the first snapshot unconditionally; state may have moved on
+        self._last_key = None
+        self._publisher = asyncio.create_task(self._run(self._wake))
+        return False
+
+    def _publish(self, payload: bytes) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Slow client: stop sending rather than buffer without limit
+                subscriber.dropped = True
+                self._subscribers.discard(subscriber)
+                metrics.sse_clients_dropped.inc()
+
+    async def _run(self, wake: asyncio.Event) -> None:
+        task = asyncio.current_task()
+        while self._publisher is task:
+            wake.clear()
+            try:
+                async with AsyncSessionLocal() as db:
+                    key = await self._state_key(db)
+                    if key != self._last_key:
+                        data = await self._snapshot(db)
+                        self._latest = f"event: {self.event}\ndata: {data}\n\n".encode()
+                        self._last_key = key
+                        self._publish(self._latest)
+            except Exception:
+                logger.exception("Failed to publish %s snapshot", self.event)
+            try:
+                await asyncio.wait_for(wake.wait(), settings.DASHBOARD_STREAM_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
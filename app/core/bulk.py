@@ -0,0 +1,129 @@
+"""Chunked bulk writes with per-item error reporting.
+
+Items are applied in chunks of BULK_CHUNK_SIZE, one transaction per chunk.
+If a chunk fails (duplicate email, missing owner, ...) it is rolled back and
+replayed one item per transaction, so a bad row only costs itself. Bodies
+over BULK_MAX_BODY_BYTES or BULK_MAX_ITEMS items are rejected with 413.
+"""
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Type
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.schemas.bulk import BulkItemError, BulkResult
+
+# (index in the request, validated item)
+IndexedItem = Tuple[int, Any]
+# Applies a chunk inside the session's open transaction and returns the
+# affected ids plus per-item errors that are not exceptions (e.g. not found)
+ChunkApplier = Callable[[AsyncSession, List[IndexedItem]], Awaitable[Tuple[List[int], List[BulkItemError]]]]
+# Turns a chunk into the items its applier takes, outside any transaction
+# (e.g. password hashing); runs once per chunk, also when it is replayed
+ChunkPreparer = Callable[[List[IndexedItem]], Awaitable[List[IndexedItem]]]
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=detail)
+
+async def _read_limited(request: Request) -> bytes:
+    limit = settings.BULK_MAX_BODY_BYTES
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > limit:
+        raise _too_large(f"Body exceeds {limit} bytes")
+    body = bytearray()
+    async for part in request.stream():
+        body.extend(part)
+        if len(body) > limit:
+            raise _too_large(f"Body exceeds {limit} bytes")
+    return bytes(body)
+
+async def read_bulk_body(request: Request) -> List[Any]:
+    """JSON array, or NDJSON when the content type says so"""
+    body = await _read_limited(request)
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            return _check_item_count([json.loads(line) for line in body.splitlines() if line.strip()])
+        items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed body: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON")
+    return _check_item_count(items)
+
+def _check_item_count(items: List[Any]) -> List[Any]:
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise _too_large(f"At most {settings.BULK_MAX_ITEMS} items per request")
+    return items
+
+def validate_items(
+    raw_items: List[Any], schema: Type[BaseModel]
+) -> Tuple[List[IndexedItem], List[BulkItemError]]:
+    valid, errors = [], []
+    for index, raw in enumerate(raw_items):
+        try:
+            valid.append((index, schema.model_validate(raw)))
+        except ValidationError as e:
+            errors.append(BulkItemError(index=index, error=_validation_message(e)))
+    return valid, errors
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+def _db_error_message(error: DBAPIError) -> str:
+    return str(error.orig).splitlines()[0] if error.orig is not None else str(error)
+
+async def apply_in_chunks(
+    db: AsyncSession,
+    items: List[IndexedItem],
+    apply_chunk: ChunkApplier,
+    errors: List[BulkItemError],
+    total: int,
+    prepare_chunk: Optional[ChunkPreparer] = None,
+) -> BulkResult:
+    ids: List[int] = []
+    chunk_size = settings.BULK_CHUNK_SIZE
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        if prepare_chunk is not None:
+            chunk = await prepare_chunk(chunk)
+        try:
+            chunk_ids, chunk_errors = await apply_chunk(db, chunk)
+            await db.commit()
+        except DBAPIError:
+            await db.rollback()
+            chunk_ids, chunk_errors = await _apply_one_by_one(db, chunk, apply_chunk)
+        ids.extend(chunk_ids)
+        errors.extend(chunk_errors)
+
+    errors.sort(key=lambda item_error: item_error.index)
+    return BulkResult(
+        total=total,
+        succeeded=len(ids),
+        failed=len(errors),
+        ids=ids,
+        errors=errors,
+    )
+
+async def _apply_one_by_one(
+    db: AsyncSession, chunk: List[IndexedItem], apply_chunk: ChunkApplier
+) -> Tuple[List[int], List[BulkItemError]]:
+    ids: List[int] = []
+    errors: List[BulkItemError] = []
+    for index, item in chunk:
+        try:
+            item_ids, item_errors = await apply_chunk(db, [(index, item)])
+            await db.commit()
+        except DBAPIError as e:
+            await db.rollback()
+            errors.append(BulkItemError(
+                index=index, id=getattr(item, "id", None), error=_db_error_message(e)
+            ))
+            continue
+        ids.extend(item_ids)
+        errors.extend(item_errors)
+    return ids, errors
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+class TTLCache:
+    """In-process async TTL cache with single-flight loading.
+
+    Concurrent misses on the same key wait on one loader call instead of
+    each hitting the database (cache stampede protection).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def _get_fresh(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    async def get_or_set(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        hit, value = self._get_fresh(key)
+        if hit:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have filled the entry while we waited
+            hit, value = self._get_fresh(key)
+            if hit:
+                return value
+            value = await loader()
+            self._prune()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def _prune(self) -> None:
+        # Keys may be versioned (e.g. by ETag), so drop expired ones on write
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+            lock = self._locks.get(key)
+            if lock is not None and not lock.locked():
+                del self._locks[key]
+
+    def invalidate(self, key: Hashable = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+class LRUCache:
+    """Size-bounded LRU cache whose entries also expire at a wall-clock time.
+
+    ``expires_at`` is a Unix timestamp so entries can be tied to a JWT ``exp``.
+    An entry may carry a ``tag`` (e.g. a user id); ``invalidate_tag`` drops
+    every entry with that tag through a secondary index, without a scan.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Hashable]]" = OrderedDict()
+        self._tagged: Dict[Hashable, Set[Hashable]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            self._delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, expires_at: float, tag: Hashable = None) -> None:
+        if key in self._entries:
+            self._delete(key)
+        self._entries[key] = (expires_at, value, tag)
+        if tag is not None:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._delete(next(iter(self._entries)))
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        keys = self._tagged.pop(tag, set())
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def _delete(self, key: Hashable) -> None:
+        _, _, tag = self._entries.pop(key)
+        if tag is not None:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tagged.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,161 @@
+"""Negotiated gzip/brotli response compression.
+
+Pure ASGI middleware: buffered bodies under COMPRESSION_MINIMUM_SIZE are sent
+as-is, larger ones are compressed in one go, and streamed bodies (exports)
+are compressed chunk by chunk with a flush per chunk so clients still see
+rows as they are produced. Brotli is used when the ``brotli`` package is
+installed and the client prefers it; gzip otherwise.
+"""
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import response_size_sent, response_size_uncompressed, route_template
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+# Server-Sent Events are encoded once and fanned out to every subscriber;
+# compressing them would redo that work per connection
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Server preference br > gzip among codings the client accepts with q > 0"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            # wbits=31: gzip container
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            chunk = self._brotli.process(data)
+            return chunk + (self._brotli.finish() if final else self._brotli.flush())
+        chunk = self._zlib.compress(data)
+        return chunk + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: Optional[str]):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.size_in = 0
+        self.size_out = 0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.size_in += len(body)
+
+        if self.start_message is not None:
+            await self._start(body, more_body)
+
+        if self.passthrough:
+            self.size_out += len(body)
+            await self.downstream(message)
+        else:
+            chunk = self.compressor.compress(body, final=not more_body)
+            self.size_out += len(chunk)
+            await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        if not more_body:
+            self._record()
+
+    async def _start(self, body: bytes, more_body: bool) -> None:
+        message, self.start_message = self.start_message, None
+        headers = MutableHeaders(scope=message)
+        content_type = headers.get("content-type", "")
+        compressible = (
+            content_type.startswith(COMPRESSIBLE_TYPES)
+            and not content_type.startswith(UNCOMPRESSED_TYPES)
+            and "content-encoding" not in headers
+        )
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        # Buffered bodies below the threshold are cheaper to send as-is;
+        # streamed bodies are compressed since their size is unknown
+        if not compressible or self.encoding is None or (not more_body and len(body) < self.middleware.minimum_size):
+            self.passthrough = True
+        else:
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            if not more_body:
+                # Single chunk: compress now so Content-Length can be set
+                compressed = self.compressor.compress(body, final=True)
+                headers["Content-Length"] = str(len(compressed))
+                self.compressor = _Precomputed(compressed)
+        await self.downstream(message)
+
+    def _record(self) -> None:
+        route = route_template(self.scope)
+        response_size_uncompressed.labels(route).observe(self.size_in)
+        encoding = "identity" if self.passthrough else self.encoding
+        response_size_sent.labels(route, encoding).observe(self.size_out)
+
+class _Precomputed:
+    """Hands back a body that was compressed while building the headers"""
+
+    def __init__(self, compressed: bytes):
+        self.compressed = compressed
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self.compressed
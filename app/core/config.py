@@ -8,11 +8,63 @@ class Settings(BaseSettings):
     
     # Database - Render auto-injects DATABASE_URL
     DATABASE_URL: str = "sqlite:///./test.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Connections all gunicorn workers may open together (Postgres
+    # max_connections minus headroom); caps the default worker count
+    DB_MAX_CONNECTIONS: int = 90
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_HEALTH_TIMEOUT_SECONDS: float = 2.0
+    
+    # Request timing - Server-Timing header, slow-query and N+1 warnings
+    SERVER_TIMING_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # Slow queries are logged with their parameters; password columns are
+    # always masked, and so is any value longer than this
+    SLOW_QUERY_PARAM_MAX_LENGTH: int = 64
+    QUERY_COUNT_WARN_THRESHOLD: int = 20
     
     # Security
     SECRET_KEY: str = "smartadmin-fallback-secret-key-change-in-production-32-chars"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verified tokens + their user are cached per worker; entries live until
+    # the token expires or AUTH_CACHE_TTL_SECONDS, whichever comes first, and
+    # are dropped within DASHBOARD_CACHE_TTL_SECONDS of any write to users
+    AUTH_CACHE_SIZE: int = 1024
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    
+    # Password hashing - bcrypt runs off the event loop in a bounded pool
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread, process
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Bulk endpoints - rows per transaction; larger bodies get 413
+    BULK_CHUNK_SIZE: int = 1000
+    BULK_MAX_ITEMS: int = 50000
+    BULK_MAX_BODY_BYTES: int = 32 * 1024 * 1024
+    
+    # Dashboard
+    DASHBOARD_CACHE_TTL_SECONDS: float = 5.0
+    # Live stream (/api/dashboard/stream): poll interval for other workers'
+    # writes, heartbeat, and per-client queue before a slow client is dropped
+    DASHBOARD_STREAM_POLL_SECONDS: float = 2.0
+    DASHBOARD_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    DASHBOARD_STREAM_CLIENT_QUEUE: int = 8
+    
+    # Activity feed - audit events are queued and written in batches
+    ACTIVITY_FEED_SIZE: int = 20
+    ACTIVITY_QUEUE_SIZE: int = 10000
+    ACTIVITY_BATCH_SIZE: int = 500
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 1.0
+    ACTIVITY_SYNC_INTERVAL_SECONDS: float = 5.0  # pull other workers' events; 0 disables
+    
+    # Response compression - gzip, or brotli when installed and accepted
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
     
     # CORS - Include Render domains
     ALLOWED_HOSTS: List[str] = [
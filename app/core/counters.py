@@ -0,0 +1,117 @@
+"""Incrementally maintained dashboard aggregates.
+
+Write handlers bump ``dashboard_counters`` in the same transaction as the row
+change, so the dashboard reads a handful of rows instead of counting
+``users``/``projects``. ``reconcile_counters.py`` rebuilds them from scratch.
+
+``version:*`` rows are not counts but per-table write versions used for
+ETags (see app/core/etag.py); every write to the table bumps them.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import delete, event, func, literal, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models.dashboard_counter import DashboardCounter
+from app.models.project import Project
+from app.models.user import User
+
+USERS_COUNTER = "users"
+
+USERS_VERSION = "version:users"
+PROJECTS_VERSION = "version:projects"
+VERSION_COUNTERS = (USERS_VERSION, PROJECTS_VERSION)
+
+# Counter snapshots for reads that accept the dashboard's staleness window.
+# A commit that bumped counters in this worker drops them, so only other
+# workers' writes can be up to one TTL late.
+counter_snapshots = TTLCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+_BUMPED = "counters_bumped"
+
+@event.listens_for(Session, "after_commit")
+def _drop_counter_snapshots(session: Session) -> None:
+    if session.info.pop(_BUMPED, False):
+        counter_snapshots.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_bumps(session: Session) -> None:
+    session.info.pop(_BUMPED, None)
+
+def project_status_counter(status: Optional[str]) -> Optional[str]:
+    return f"projects:{status}" if status else None
+
+def _upsert_counter(dialect_name: str, name: str, delta: int):
+    stmt = dialect_insert(dialect_name)(DashboardCounter).values(name=name, value=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=[DashboardCounter.name],
+        set_={"value": DashboardCounter.value + delta},
+    )
+
+async def bump_counters(db: AsyncSession, deltas: Dict[Optional[str], int]) -> None:
+    """Apply counter deltas inside the caller's transaction (commit is theirs)"""
+    dialect_name = db.bind.dialect.name
+    db.info[_BUMPED] = True
+    # Stable order so concurrent writers lock counter rows the same way
+    for name in sorted(key for key in deltas if key):
+        if deltas[name]:
+            await db.execute(_upsert_counter(dialect_name, name, deltas[name]))
+
+async def read_counters(db: AsyncSession, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    stmt = select(DashboardCounter.name, DashboardCounter.value)
+    if names is not None:
+        stmt = stmt.where(DashboardCounter.name.in_(list(names)))
+    rows = (await db.execute(stmt)).all()
+    return {row.name: row.value for row in rows}
+
+async def read_counters_cached(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """read_counters, reused from this worker's snapshot for up to the dashboard TTL"""
+    key = tuple(sorted(names))
+    return await counter_snapshots.get_or_set(key, lambda: read_counters(db, key))
+
+def count_from_source(db: Session) -> Dict[str, int]:
+    """Full recount from users/projects in one round-trip"""
+    stmt = union_all(
+        select(literal(USERS_COUNTER).label("name"), func.count(User.id).label("value")),
+        select(Project.status.label("name"), func.count(Project.id).label("value"))
+        .where(Project.status.is_not(None))
+        .group_by(Project.status),
+    )
+    counts = {}
+    for row in db.execute(stmt).all():
+        name = row.name if row.name == USERS_COUNTER else project_status_counter(row.name)
+        counts[name] = row.value
+    return counts
+
+def rebuild_counters(db: Session) -> Dict[str, Tuple[int, int]]:
+    """Rewrite dashboard_counters from source tables, returning drift as {name: (stored, actual)}.
+
+    Version counters are kept and bumped, so ETags issued before the rebuild
+    never match again."""
+    if db.bind.dialect.name == "postgresql":
+        # Block counter bumps until the rebuilt values are committed; writers
+        # whose rows we could not see yet apply their delta on top afterwards
+        db.execute(text("LOCK TABLE dashboard_counters IN EXCLUSIVE MODE"))
+    actual = count_from_source(db)
+    is_count = DashboardCounter.name.not_in(VERSION_COUNTERS)
+    stored = {
+        row.name: row.value
+        for row in db.execute(
+            select(DashboardCounter.name, DashboardCounter.value).where(is_count)
+        ).all()
+    }
+
+    drift = {
+        name: (stored.get(name, 0), actual.get(name, 0))
+        for name in set(actual) | set(stored)
+        if stored.get(name, 0) != actual.get(name, 0)
+    }
+
+    db.execute(delete(DashboardCounter).where(is_count))
+    db.add_all(DashboardCounter(name=name, value=value) for name, value in actual.items())
+    for name in VERSION_COUNTERS:
+        db.execute(_upsert_counter(db.bind.dialect.name, name, 1))
+    db.info[_BUMPED] = True
+    db.commit()
+    return drift
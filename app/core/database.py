@@ -1,17 +1,147 @@
-from sqlalchemy import create_engine
+import asyncio
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from app.core import metrics
 from app.core.config import settings
+from app.core.timing import instrument_engine
 
 # SQLAlchemy 2.0 style
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(settings.DATABASE_URL)
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its async driver (asyncpg / aiosqlite)"""
+    if url.startswith("postgres://"):
+        # Render / Heroku still hand out the legacy scheme
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
+def get_sync_database_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+class _CheckoutTimingMixin:
+    """Records how long checkouts wait for a free connection"""
+
+    metrics_label = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+            metrics.db_pool_checkout_wait.labels(self.metrics_label).observe(waited)
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    metrics_label = "scripts"
+
+class TimedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics_label = "api"
+
+def instrument_pool(engine, label: str) -> None:
+    """Keep the pool gauges in step with checkouts (sampled, so self-correcting)"""
+    def sample(returning: int = 0):
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            metrics.db_pool_size.labels(label).set(pool.size())
+            metrics.db_pool_checked_out.labels(label).set(max(pool.checkedout() - returning, 0))
+
+    # checkin fires just before the connection goes back to the pool
+    event.listen(engine, "checkout", lambda *_: sample())
+    event.listen(engine, "checkin", lambda *_: sample(returning=1))
+    sample()
+
+def get_pool_options(url: str, poolclass) -> dict:
+    if url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] in ("", "/")):
+        # In-memory SQLite needs its single shared connection
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+# Sync engine - used by init_db.py / seed_data.py and other CLI scripts
+sync_database_url = get_sync_database_url(settings.DATABASE_URL)
+engine = create_engine(sync_database_url, **get_pool_options(sync_database_url, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine)
+instrument_pool(engine, TimedQueuePool.metrics_label)
+
+# Async engine - used by the API route handlers
+async_database_url = get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    async_database_url, **get_pool_options(async_database_url, TimedAsyncQueuePool)
+)
+instrument_engine(async_engine.sync_engine)
+instrument_pool(async_engine.sync_engine, TimedAsyncQueuePool.metrics_label)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
-def get_db():
-    db = SessionLocal()
-    try:
+def dialect_insert(dialect_name: str):
+    """INSERT construct with ON CONFLICT support for the active dialect"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+def pool_stats(pool) -> dict:
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+        })
+    if isinstance(pool, _CheckoutTimingMixin):
+        average = pool.wait_time_total / pool.wait_count if pool.wait_count else 0.0
+        stats.update({
+            "checkouts": pool.wait_count,
+            "wait_time_avg_ms": round(average * 1000, 3),
+            "wait_time_max_ms": round(pool.wait_time_max * 1000, 3),
+        })
+    return stats
+
+async def ping_database(timeout: float) -> float:
+    """Round-trip SELECT 1 through the API pool; returns latency in ms"""
+    start = time.perf_counter()
+
+    async def probe():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.wait_for(probe(), timeout=timeout)
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,131 @@
+"""Conditional GETs (ETag / If-None-Match) backed by table version counters.
+
+Write handlers bump ``version:<table>`` in ``dashboard_counters`` in the same
+transaction as the row change, so a read can tell whether the client's copy
+is current with one primary-key lookup. A match is answered with 304 from
+the dependency, before the handler's query or serialization runs. Endpoints
+that already tolerate a TTL (the dashboard) reuse a cached version snapshot
+instead, so a poll within the TTL issues no query at all.
+
+Detail GETs and writes tag a single resource by its ``updated_at`` instead:
+``W/"<updated_at>"`` (``W/"null"`` for a row that has never been updated),
+followed by ``;<digest>`` when ``?include=`` nests a related table. Writes
+accept that ETag in ``If-Match`` for optimistic concurrency, as well as the
+bare ``updated_at`` exactly as returned in the body.
+"""
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.counters import read_counters, read_counters_cached
+from app.core.database import get_db
+
+# Clients may store responses but must revalidate before every reuse
+CACHE_CONTROL = "private, no-cache"
+
+def _digest(*parts: Any) -> str:
+    return hashlib.blake2b(":".join(str(part) for part in parts).encode(), digest_size=8).hexdigest()
+
+def make_etag(*parts: Any) -> str:
+    return f'W/"{_digest(*parts)}"'
+
+def resource_etag(updated_at: Optional[datetime], *parts: Any) -> str:
+    """ETag for one row; ``parts`` are versions of tables nested via ``?include=``"""
+    tag = updated_at.isoformat() if updated_at is not None else "null"
+    if parts:
+        tag = f"{tag};{_digest(*parts)}"
+    return f'W/"{tag}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def conditional_etag(
+    *versions: str,
+    extra: Optional[Callable[[], Iterable[Any]]] = None,
+    include_versions: Optional[Dict[str, str]] = None,
+    cached: bool = False,
+):
+    """Dependency factory: ETag from the given version counters (plus ``extra()``
+    parts for data that also changes with time, and the versions of related
+    tables nested via ``?include=``). ``cached`` reads the versions through
+    ``read_counters_cached``. Raises 304 on a match, otherwise sets
+    ETag/Cache-Control on the response and returns the headers so handlers
+    returning their own Response can pass them on."""
+    async def dependency(
+        request: Request, response: Response, db: AsyncSession = Depends(get_db)
+    ) -> Dict[str, str]:
+        names = list(versions)
+        include = request.query_params.get("include")
+        if include_versions and include in include_versions:
+            names.append(include_versions[include])
+        current = await (read_counters_cached if cached else read_counters)(db, names)
+        parts = [request.url.path, *(current.get(name, 0) for name in names)]
+        if extra is not None:
+            parts.extend(extra())
+        headers = {"ETag": make_etag(*parts), "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return headers
+    return dependency
+
+async def conditional_resource(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    updated_at: Optional[datetime],
+    versions: Iterable[str] = (),
+) -> Dict[str, str]:
+    """Conditional GET for a row already loaded by the handler: ETag from its
+    ``updated_at`` plus the given version counters. Raises 304 on a match,
+    otherwise sets ETag/Cache-Control on the response and returns them."""
+    versions = list(versions)
+    current = await read_counters(db, versions) if versions else {}
+    etag = resource_etag(updated_at, *(current.get(name, 0) for name in versions))
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+def has_precondition(if_match: Optional[str]) -> bool:
+    # "*" only asks for the row to exist, which the write checks anyway
+    return if_match is not None and if_match.strip() != "*"
+
+def if_match_conditions(updated_at_column, if_match: Optional[str]) -> List[Any]:
+    """WHERE clauses for an If-Match precondition; [] when absent or ``*``"""
+    if not has_precondition(if_match):
+        return []
+    matches = []
+    for tag in if_match.split(","):
+        # A resource ETag (weak or not, nested-table digest dropped) or the bare updated_at
+        value = tag.strip().removeprefix("W/").strip('"').split(";", 1)[0]
+        if value == "null":
+            matches.append(updated_at_column.is_(None))
+            continue
+        try:
+            matches.append(updated_at_column == datetime.fromisoformat(value))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail="If-Match must be the resource's ETag, updated_at, null or *"
+            )
+    return [or_(*matches)]
+
+async def raise_write_miss(
+    db: AsyncSession, id_column, row_id: int, if_match: Optional[str], detail: str
+) -> None:
+    """A conditional UPDATE/DELETE affected no rows: 412 if the row exists, else 404.
+    The extra lookup only runs on this failure path."""
+    if has_precondition(if_match):
+        exists = (await db.execute(select(id_column).where(id_column == row_id))).first()
+        if exists is not None:
+            raise HTTPException(status_code=412, detail="Resource was modified (If-Match failed)")
+    raise HTTPException(status_code=404, detail=detail)
@@ -0,0 +1,60 @@
+"""Streaming NDJSON/CSV export from a server-side cursor.
+
+Rows are fetched ``EXPORT_BATCH_SIZE`` at a time with ``yield_per`` and
+encoded straight to the response, so memory stays flat regardless of table
+size. The generator opens its own session because the response body is sent
+after the request's ``get_db`` dependency may already have closed.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from app.core.database import AsyncSessionLocal
+
+EXPORT_BATCH_SIZE = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+async def _stream_rows(stmt: Select, export_format: ExportFormat) -> AsyncIterator[str]:
+    columns = [column.key for column in stmt.selected_columns]
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+            return
+
+        async for rows in result.partitions():
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+                for row in rows
+            )
+
+def export_response(stmt: Select, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_rows(stmt, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
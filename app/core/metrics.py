@@ -0,0 +1,111 @@
+"""Prometheus metrics, labelled by route template.
+
+Under gunicorn set PROMETHEUS_MULTIPROC_DIR to an empty directory shared by
+the workers (before the app is imported): every worker then writes its
+samples to mmap files there and /metrics aggregates all of them, whichever
+worker answers the scrape. Without it the default in-process registry is used.
+"""
+import os
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+# Response sizes in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Time to response headers, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# SQL statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Waits for a pooled DB connection / a bcrypt slot, in seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+def route_template(scope) -> str:
+    """Path template of the matched route (``/api/projects/{project_id}``) so
+    labels stay bounded; only valid once routing has run"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+# Requests
+requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status",
+    ("method", "route", "status"),
+)
+requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time to response headers",
+    ("method", "route"), buckets=DURATION_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_db_queries", "SQL statements per request",
+    ("route",), buckets=QUERY_COUNT_BUCKETS,
+)
+
+# Payload sizes (see app/core/compression.py)
+response_size_uncompressed = Histogram(
+    "http_response_size_uncompressed_bytes", "Response body size before compression",
+    ("route",), buckets=SIZE_BUCKETS,
+)
+response_size_sent = Histogram(
+    "http_response_size_sent_bytes", "Response body size on the wire",
+    ("route", "encoding"), buckets=SIZE_BUCKETS,
+)
+
+# Database pools: "api" (async engine) and "scripts" (sync engine)
+db_pool_size = Gauge(
+    "db_pool_size", "Configured pool size", ("pool",), multiprocess_mode="livesum",
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ("pool",), multiprocess_mode="livesum",
+)
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    ("pool",), buckets=WAIT_BUCKETS,
+)
+
+# bcrypt worker pool (see app/core/security.py)
+password_hash_queued = Gauge(
+    "password_hash_queued", "Hash jobs waiting for a worker slot", multiprocess_mode="livesum",
+)
+password_hash_running = Gauge(
+    "password_hash_running", "Hash jobs running in the worker pool", multiprocess_mode="livesum",
+)
+password_hash_jobs = Counter(
+    "password_hash_jobs_total", "Completed bcrypt hash/verify jobs",
+)
+
+# Activity feed writer (see app/core/activity.py)
+activity_queue_depth = Gauge(
+    "activity_queue_depth", "Activity events waiting to be written", multiprocess_mode="livesum",
+)
+activity_events_dropped = Counter(
+    "activity_events_dropped_total", "Activity events lost to a full queue or a failed write",
+)
+
+# Startup phases: app import, DB bootstrap check, lifespan startup, and
+# lifespan start to the first response (time to first request)
+startup_seconds = Gauge(
+    "app_startup_seconds", "Duration of startup phases", ["phase"], multiprocess_mode="max",
+)
+
+# Dashboard SSE stream (see app/core/broadcast.py)
+sse_subscribers = Gauge(
+    "sse_subscribers", "Connected Server-Sent Events clients", multiprocess_mode="livesum",
+)
+sse_clients_dropped = Counter(
+    "sse_clients_dropped_total", "SSE clients dropped for falling behind",
+)
+
+def render_metrics() -> bytes:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges; call from gunicorn's child_exit"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,28 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException
+
+def encode_cursor(position: dict) -> str:
+    """Opaque keyset cursor for the next page"""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+def decode_id_cursor(cursor: str) -> Optional[int]:
+    """Last seen id from an id-ordered cursor (None for the first page)"""
+    after_id = decode_cursor(cursor).get("id")
+    if after_id is not None and not isinstance(after_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
@@ -0,0 +1,131 @@
+"""User signup time series backed by bucketed rollups.
+
+Closed day/week/month buckets are written to ``user_signup_rollups`` the
+first time they are needed, so historical ranges never scan ``users``; only
+the current (open) bucket is counted live.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple, Union
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import dialect_insert
+from app.models.user import User
+from app.models.user_signup_rollup import UserSignupRollup
+
+BUCKETS = ("day", "week", "month")
+INSERT_CHUNK_SIZE = 1000
+
+def as_utc(value: Union[datetime, str]) -> datetime:
+    # SQLite hands back naive datetimes or ISO strings; both are UTC
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def bucket_floor(value: Union[datetime, str], bucket: str) -> datetime:
+    value = as_utc(value)
+    start = datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if bucket == "week":
+        return start - timedelta(days=start.weekday())
+    if bucket == "month":
+        return start.replace(day=1)
+    return start
+
+def add_buckets(start: datetime, bucket: str, count: int) -> datetime:
+    if bucket == "day":
+        return start + timedelta(days=count)
+    if bucket == "week":
+        return start + timedelta(weeks=count)
+    month_index = start.year * 12 + start.month - 1 + count
+    return start.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+def bucket_label(start: datetime, bucket: str) -> str:
+    if bucket == "month":
+        return start.strftime("%b %Y")
+    return start.strftime("%Y-%m-%d")
+
+def _bucket_expression(dialect_name: str, bucket: str):
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket, func.timezone("UTC", User.created_at))
+    if bucket == "week":
+        return func.date(User.created_at, "weekday 0", "-6 days")
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", User.created_at)
+    return func.date(User.created_at)
+
+async def fill_closed_buckets(db: AsyncSession, bucket: str, open_start: datetime) -> None:
+    """Roll up every closed bucket after the last stored one"""
+    last_stmt = select(func.max(UserSignupRollup.bucket_start)).where(
+        UserSignupRollup.bucket == bucket
+    )
+    last_rolled = (await db.execute(last_stmt)).scalar()
+    if last_rolled is not None:
+        fill_from = add_buckets(as_utc(last_rolled), bucket, 1)
+    else:
+        first_signup = (await db.execute(select(func.min(User.created_at)))).scalar()
+        if first_signup is None:
+            return
+        fill_from = bucket_floor(first_signup, bucket)
+
+    if fill_from >= open_start:
+        return
+
+    dialect_name = db.bind.dialect.name
+    bucket_start = _bucket_expression(dialect_name, bucket).label("bucket_start")
+    stmt = (
+        select(bucket_start, func.count(User.id).label("signups"))
+        .where(User.created_at >= fill_from, User.created_at < open_start)
+        .group_by(bucket_start)
+    )
+    counts = {
+        bucket_floor(row.bucket_start, bucket): row.signups
+        for row in (await db.execute(stmt)).all()
+    }
+
+    rows = []
+    cursor = fill_from
+    while cursor < open_start:
+        rows.append({"bucket": bucket, "bucket_start": cursor, "signups": counts.get(cursor, 0)})
+        cursor = add_buckets(cursor, bucket, 1)
+
+    insert = dialect_insert(dialect_name)
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        # Concurrent requests may roll up the same buckets; first writer wins
+        stmt = insert(UserSignupRollup).values(rows[i:i + INSERT_CHUNK_SIZE])
+        await db.execute(stmt.on_conflict_do_nothing())
+    await db.commit()
+
+async def get_signup_series(
+    db: AsyncSession, bucket: str, start: datetime, end: datetime
+) -> List[Tuple[datetime, int]]:
+    """Signups per bucket from the bucket containing ``start`` to the one containing ``end``"""
+    now = datetime.now(timezone.utc)
+    open_start = bucket_floor(now, bucket)
+    first = bucket_floor(start, bucket)
+    last = bucket_floor(min(as_utc(end), now), bucket)
+    if first > last:
+        return []
+
+    await fill_closed_buckets(db, bucket, open_start)
+
+    stmt = select(UserSignupRollup.bucket_start, UserSignupRollup.signups).where(
+        UserSignupRollup.bucket == bucket,
+        UserSignupRollup.bucket_start >= first,
+        UserSignupRollup.bucket_start <= last,
+    )
+    counts = {
+        as_utc(row.bucket_start): row.signups
+        for row in (await db.execute(stmt)).all()
+    }
+
+    if last == open_start:
+        live_stmt = select(func.count(User.id)).where(User.created_at >= open_start)
+        counts[open_start] = (await db.execute(live_stmt)).scalar()
+
+    series = []
+    cursor = first
+    while cursor <= last:
+        series.append((cursor, counts.get(cursor, 0)))
+        cursor = add_buckets(cursor, bucket, 1)
+    return series
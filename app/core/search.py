@@ -0,0 +1,33 @@
+"""Free-text search over projects.name / projects.description.
+
+Postgres matches against a GIN-indexed ``to_tsvector`` expression; SQLite
+uses the ``projects_fts`` FTS5 table. Both are created by Alembic revision
+0002, and the document expression below must stay identical to the indexed
+one (constants inlined, not bound) for the planner to use the index.
+"""
+from sqlalchemy import func, literal_column, select, text
+from app.models.project import Project
+
+FTS_CONFIG = "simple"  # Mixed Spanish/English content, so no stemming
+
+def project_document():
+    config = literal_column(f"'{FTS_CONFIG}'::regconfig")
+    empty = literal_column("''")
+    return func.to_tsvector(
+        config,
+        func.coalesce(Project.name, empty).op("||")(literal_column("' '"))
+        .op("||")(func.coalesce(Project.description, empty)),
+    )
+
+def _fts5_query(q: str) -> str:
+    # Quote each term so user input cannot use FTS5 operators
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+def project_search_condition(dialect_name: str, q: str):
+    if dialect_name == "postgresql":
+        config = literal_column(f"'{FTS_CONFIG}'::regconfig")
+        return project_document().op("@@")(func.plainto_tsquery(config, q))
+    fts_ids = select(literal_column("rowid")).select_from(text("projects_fts")).where(
+        text("projects_fts MATCH :fts_query").bindparams(fts_query=_fts5_query(q))
+    )
+    return Project.id.in_(fts_ids)
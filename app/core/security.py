@@ -1,10 +1,15 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
+from app.core import metrics
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -22,5 +27,83 @@ def create_access_token(
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored cost is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+# Bounded bcrypt pool
+# bcrypt costs 100-300 ms of CPU per call, so the async handlers hand it to
+# a worker pool. The semaphore caps in-flight jobs at the pool size; anything
+# beyond that waits here, where it is visible as queue depth.
+_hash_executor: Optional[Executor] = None
+_hash_slots: Optional[asyncio.Semaphore] = None
+_hash_stats = {"queued": 0, "running": 0, "completed": 0}
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+            )
+    return _hash_executor
+
+def _get_hash_slots() -> asyncio.Semaphore:
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+    return _hash_slots
+
+async def _run_hash_job(func, *args):
+    slots = _get_hash_slots()
+    _hash_stats["queued"] += 1
+    metrics.password_hash_queued.inc()
+    try:
+        await slots.acquire()
+    finally:
+        _hash_stats["queued"] -= 1
+        metrics.password_hash_queued.dec()
+    _hash_stats["running"] += 1
+    metrics.password_hash_running.inc()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_stats["running"] -= 1
+        _hash_stats["completed"] += 1
+        metrics.password_hash_running.dec()
+        metrics.password_hash_jobs.inc()
+        slots.release()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return await _run_hash_job(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_job(get_password_hash, password)
+
+def password_hash_pool_stats() -> dict:
+    return {
+        "executor": settings.PASSWORD_HASH_EXECUTOR,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "rounds": settings.BCRYPT_ROUNDS,
+        **_hash_stats,
+    }
+
+def shutdown_password_hash_pool() -> None:
+    global _hash_executor, _hash_slots
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+    _hash_executor = None
+    _hash_slots = None
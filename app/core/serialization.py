@@ -0,0 +1,69 @@
+"""Column-projected reads and the orjson response path.
+
+List and detail endpoints can select only the columns of the response
+schema (or the subset asked for with ``fields=``) as row tuples and encode
+them with orjson, skipping ORM instances, per-row Pydantic validation and
+jsonable_encoder. With every field selected the output matches the regular
+response_model JSON.
+"""
+import functools
+import time
+from typing import Any, Dict, List, Optional, Sequence, Type
+import orjson
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter
+from app.core.timing import record_serialization
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """``fields=id,name`` -> ["id", "name"]; None when the parameter is absent"""
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    if not names:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(schema.model_fields)}",
+        )
+    return names
+
+def schema_columns(
+    model, schema: Type[BaseModel], fields: Optional[List[str]] = None, required: Sequence[str] = ()
+) -> list:
+    """Model columns for ``fields`` (every schema field when None), plus the
+    ``required`` ones the handler itself needs, e.g. ``id`` for cursors"""
+    names = list(fields) if fields is not None else list(schema.model_fields)
+    names.extend(name for name in required if name not in names)
+    return [getattr(model, name) for name in names]
+
+def rows_as_dicts(rows: Sequence[Any], fields: Optional[List[str]] = None) -> List[dict]:
+    if fields is None:
+        return [row._asdict() for row in rows]
+    return [{name: row._mapping[name] for name in fields} for row in rows]
+
+def reject_projection_with_include(projected: bool, include: Optional[str]) -> None:
+    if projected and include is not None:
+        raise HTTPException(status_code=400, detail="include cannot be combined with fast or fields")
+
+@functools.lru_cache(maxsize=None)
+def _adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+def model_json_response(response_type, content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Validate ORM objects (eagerly loaded relationships included) against
+    ``response_type`` and encode with pydantic-core, for responses whose shape
+    depends on a query parameter and so cannot be the route's response_model"""
+    adapter = _adapter(response_type)
+    start = time.perf_counter()
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    record_serialization(time.perf_counter() - start)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def fast_json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    start = time.perf_counter()
+    # UTC as "Z", as pydantic writes it (orjson defaults to "+00:00")
+    body = orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    record_serialization(time.perf_counter() - start)
+    return Response(content=body, media_type="application/json", headers=headers)
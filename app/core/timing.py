@@ -0,0 +1,209 @@
+"""Per-request timing: DB time, query count, serialization and total.
+
+Engine event hooks add every statement's duration to the current request's
+``RequestStats`` (a ContextVar set by ``ServerTimingMiddleware``) and log
+statements slower than SLOW_QUERY_THRESHOLD_MS along with their parameters,
+masking password columns and values longer than SLOW_QUERY_PARAM_MAX_LENGTH.
+``TimedRoute`` marks when the endpoint returns, so the time FastAPI spends
+validating and encoding the result is reported separately. The numbers go
+out as a ``Server-Timing`` header and into the Prometheus metrics.
+"""
+import asyncio
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import (
+    request_duration, request_queries, requests_in_progress, requests_total, route_template,
+    startup_seconds,
+)
+
+logger = logging.getLogger("smartadmin.sql")
+
+MASKED = "***"
+
+@dataclass
+class RequestStats:
+    started: float
+    queries: int = 0
+    db_time: float = 0.0
+    serialization_time: float = 0.0
+    endpoint_done: Optional[float] = None
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+def record_serialization(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.serialization_time += seconds
+
+def _mask(key: Optional[str], value: Any) -> Any:
+    if key is not None and "password" in key.lower():
+        return MASKED
+    if isinstance(value, (str, bytes)) and len(value) > settings.SLOW_QUERY_PARAM_MAX_LENGTH:
+        return f"{MASKED} ({len(value)} long)"
+    return value
+
+def loggable_parameters(context, parameters, executemany: bool) -> str:
+    """First parameter set of a statement with sensitive values masked"""
+    if context is not None and context.compiled is not None and context.compiled_parameters:
+        # Keyed by bind name even when the driver takes positional parameters
+        sets = context.compiled_parameters
+    else:
+        sets = parameters if executemany else [parameters]
+    if not sets or not sets[0]:
+        return ""
+    first = sets[0]
+    if isinstance(first, Mapping):
+        masked = {key: _mask(key, value) for key, value in first.items()}
+    elif isinstance(first, (list, tuple)):
+        masked = type(first)(_mask(None, value) for value in first)
+    else:
+        masked = first
+    more = f" (+{len(sets) - 1} more)" if len(sets) > 1 else ""
+    return f" {masked!r}{more}"
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach timing hooks to a sync Engine (use ``async_engine.sync_engine``)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning(
+                "Slow query (%.1f ms)%s: %s%s",
+                elapsed * 1000,
+                " [executemany]" if executemany else "",
+                " ".join(statement.split()),
+                loggable_parameters(context, parameters, executemany),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute doesn't run for a statement that raised
+        connection = exception_context.connection
+        if connection is not None and exception_context.statement is not None:
+            started = connection.info.get("query_start_time")
+            if started:
+                started.pop()
+
+class TimedRoute(APIRoute):
+    """APIRoute that marks when the endpoint returns, so the remaining time
+    in the route handler (response_model validation + JSON encoding) can be
+    reported as serialization"""
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def timed_call(**values):
+                try:
+                    return await call(**values)
+                finally:
+                    _mark_endpoint_done()
+        else:
+            @functools.wraps(call)
+            def timed_call(**values):
+                try:
+                    return call(**values)
+                finally:
+                    _mark_endpoint_done()
+        self.dependant.call = timed_call
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            stats = _request_stats.get()
+            if stats is not None and stats.endpoint_done is not None:
+                stats.serialization_time += time.perf_counter() - stats.endpoint_done
+            return response
+        return timed_handler
+
+def _mark_endpoint_done() -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.endpoint_done = time.perf_counter()
+
+class ServerTimingMiddleware:
+    """Sets up RequestStats for each HTTP request and reports it, along with
+    request counts and in-flight requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(started=time.perf_counter())
+        token = _request_stats.set(stats)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Streamed bodies are still being produced; total is time to headers
+                total = time.perf_counter() - stats.started
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append("Server-Timing", ", ".join([
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+                        f"serialize;dur={stats.serialization_time * 1000:.1f}",
+                        f"total;dur={total * 1000:.1f}",
+                    ]))
+                _report(scope, stats, total)
+            await send(message)
+
+        requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            requests_in_progress.dec()
+            requests_total.labels(scope["method"], route_template(scope), str(status)).inc()
+            _request_stats.reset(token)
+
+_startup_began: Optional[float] = None
+
+def mark_startup_began() -> None:
+    """Called at the start of lifespan; the first response then records
+    time to first request"""
+    global _startup_began
+    _startup_began = time.perf_counter()
+
+def _first_request_served() -> None:
+    global _startup_began
+    if _startup_began is not None:
+        startup_seconds.labels("first_request").set(time.perf_counter() - _startup_began)
+        _startup_began = None
+
+def _report(scope: Scope, stats: RequestStats, total: float) -> None:
+    _first_request_served()
+    route = route_template(scope)
+    request_duration.labels(scope["method"], route).observe(total)
+    request_queries.labels(route).observe(stats.queries)
+    if stats.queries > settings.QUERY_COUNT_WARN_THRESHOLD:
+        # Usually a lazy relationship (User.projects / Project.owner) in a loop
+        logger.warning(
+            "%s %s ran %d queries (threshold %d) - possible N+1",
+            scope.get("method"), route, stats.queries, settings.QUERY_COUNT_WARN_THRESHOLD,
+        )
@@ -1,8 +1,20 @@
+import time
+_import_started = time.perf_counter()
+
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 import os
 from app.core.config import settings
+from app.core import security
+from app.core.activity import activity_log
+from app.core.compression import CompressionMiddleware
+from app.core.database import async_engine, engine, ping_database, pool_stats
+from app.core.metrics import render_metrics, startup_seconds
+from app.core.timing import ServerTimingMiddleware, mark_startup_began
 from app.api.auth.router import router as auth_router
 from app.api.dashboard.router import router as dashboard_router
 from app.api.users.router import router as users_router
@@ -11,20 +23,28 @@ from app.api.projects.router import router as projects_router
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    started = time.perf_counter()
+    mark_startup_began()
+    # Under gunicorn the master bootstraps once before forking (see
+    # gunicorn.conf.py); otherwise every process checks the schema marker
+    # and at most one bootstraps, serialized by a lock
     if os.getenv("RENDER"):
-        print("🌐 Running on Render - initializing database...")
+        from app.core.bootstrap import bootstrap_database
+        print("🌐 Running on Render - checking database...")
         try:
-            from init_db import init_db
-            from seed_data import seed_data
-            
-            init_success = init_db()
-            if init_success:
-                seed_data()
+            bootstrap_database()
         except Exception as e:
             print(f"⚠️  Database initialization error: {e}")
+    # Rebuilds the activity feed from the table and starts its writer
+    await activity_log.start()
+    elapsed = time.perf_counter() - started
+    startup_seconds.labels("lifespan").set(elapsed)
+    print(f"🚀 Ready in {elapsed * 1000:.0f} ms (app import took {import_seconds * 1000:.0f} ms)")
     yield
     # Shutdown
     print("👋 Shutting down SmartAdmin API...")
+    await activity_log.stop()
+    security.shutdown_password_hash_pool()
 
 app = FastAPI(
     title="SmartAdmin API",
@@ -44,6 +64,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/brotli for JSON/NDJSON/CSV bodies above the size threshold
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Outermost: Server-Timing (db, serialize, total) and per-request query counts
+app.add_middleware(ServerTimingMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(dashboard_router, prefix="/api/dashboard", tags=["Dashboard"])
@@ -62,9 +93,49 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    # Real DB probe so the load balancer stops routing to workers whose
+    # pool is exhausted or whose database is unreachable
+    try:
+        latency_ms = await ping_database(settings.DB_HEALTH_TIMEOUT_SECONDS)
+        database = {"status": "ok", "latency_ms": round(latency_ms, 2)}
+    except asyncio.TimeoutError:
+        database = {"status": "timeout", "timeout_seconds": settings.DB_HEALTH_TIMEOUT_SECONDS}
+    except Exception as e:
+        database = {"status": "error", "error": type(e).__name__}
+    
+    healthy = database["status"] == "ok"
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy", 
+            "version": "2.0.0",
+            "stack": "modern",
+            "database": async_engine.dialect.name,
+            "database_probe": database,
+            "password_hashing": security.password_hash_pool_stats()
+        }
+    )
+
+@app.get("/health/pool")
+async def pool_health():
     return {
-        "status": "healthy", 
-        "version": "2.0.0",
-        "stack": "modern",
-        "database": "postgresql"
-    }
\ No newline at end of file
+        "api": pool_stats(async_engine.pool),
+        "scripts": pool_stats(engine.pool),
+        "settings": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    # Prometheus text format; aggregated across workers in multiprocess mode
+    # Set verbatim: media_type would append a second "; charset=utf-8"
+    return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+# Everything above ran at import (once in the gunicorn master with preload)
+import_seconds = time.perf_counter() - _import_started
+startup_seconds.labels("import").set(import_seconds)
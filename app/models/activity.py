@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.core.database import Base
+
+class Activity(Base):
+    __tablename__ = "activities"
+
+    # Append-only audit log written in batches by app/core/activity.py; no
+    # foreign keys so deleting a user or project keeps its history
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(String(32), nullable=False)  # uuid4 hex, assigned in-process
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    action = Column(String, nullable=False)  # project.created, user.updated, ...
+    subject_type = Column(String, nullable=False)  # user, project
+    subject_id = Column(Integer)
+    subject_name = Column(String)
+    actor_id = Column(Integer)
+    actor_name = Column(String)
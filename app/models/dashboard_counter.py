@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, BigInteger
+from app.core.database import Base
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+
+    # users, projects:active, projects:completed, projects:paused, ...
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
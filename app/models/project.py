@@ -1,15 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Per-owner listings, newest first
+        Index("ix_projects_owner_id_created_at", "owner_id", "created_at"),
+        # Date-range filters and sort=created_at / sort=name (id breaks ties)
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_name_id", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
-    status = Column(String, default="active")  # active, completed, paused
+    status = Column(String, default="active", index=True)  # active, completed, paused
     priority = Column(String, default="medium")  # low, medium, high
     owner_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from app.core.database import Base
+
+class UserSignupRollup(Base):
+    __tablename__ = "user_signup_rollups"
+
+    # One row per closed bucket (zero-signup buckets included)
+    bucket = Column(String, primary_key=True)  # day, week, month
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    signups = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class BulkItemError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: str
+
+class BulkResult(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    ids: List[int]
+    errors: List[BulkItemError]
+
+class BulkDeleteItem(BaseModel):
+    id: int
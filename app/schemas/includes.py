@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.project import Project
+from app.schemas.user import User
+
+# Responses for ?include=..., with the related rows nested
+class ProjectWithOwner(Project):
+    owner: Optional[User] = None
+
+class ProjectWithOwnerPage(BaseModel):
+    items: List[ProjectWithOwner]
+    next_cursor: Optional[str] = None
+
+class UserWithProjects(User):
+    projects: List[Project] = []
+
+class UserWithProjectsPage(BaseModel):
+    items: List[UserWithProjects]
+    next_cursor: Optional[str] = None
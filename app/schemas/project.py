@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ProjectBase(BaseModel):
     name: str
@@ -17,6 +17,9 @@ class ProjectUpdate(BaseModel):
     status: Optional[str] = None
     priority: Optional[str] = None
 
+class ProjectBulkUpdate(ProjectUpdate):
+    id: int
+
 class Project(ProjectBase):
     id: int
     owner_id: int
@@ -24,4 +27,8 @@ class Project(ProjectBase):
     updated_at: Optional[datetime] = None
     
     # Pydantic V2 style
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ProjectPage(BaseModel):
+    items: List[Project]
+    next_cursor: Optional[str] = None
\ No newline at end of file
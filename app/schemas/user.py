@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -17,14 +17,22 @@ class UserUpdate(BaseModel):
     full_name: Optional[str] = None
     is_active: Optional[bool] = None
 
+class UserBulkUpdate(UserUpdate):
+    id: int
+
 class User(UserBase):
     id: int
     is_admin: bool
     created_at: datetime
+    updated_at: Optional[datetime] = None
     
     # Pydantic V2 style
     model_config = ConfigDict(from_attributes=True)
 
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str
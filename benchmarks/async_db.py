@@ -0,0 +1,100 @@
+"""Event loop blocking benchmark: sync Session vs AsyncSession
+
+Runs N slow queries concurrently while probing /health and reports the probe
+latency. With the old sync ``Session`` every slow query stalls the event loop,
+so /health waits behind them; with ``AsyncSession`` it stays flat.
+
+    python -m benchmarks.async_db --concurrency 20 --sleep-ms 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import SessionLocal, async_engine, engine, get_db
+from app.main import app
+
+
+def _register_sqlite_sleep(dbapi_connection, connection_record):
+    # SQLite has no pg_sleep(); emulate a slow statement
+    dbapi_connection.create_function("pg_sleep", 1, lambda seconds: time.sleep(seconds))
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _register_sqlite_sleep)
+    event.listen(async_engine.sync_engine, "connect", _register_sqlite_sleep)
+
+
+async def slow_sync(seconds: float):
+    # The pre-async pattern: blocking Session inside an async handler
+    with SessionLocal() as db:
+        db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+    return {"ok": True}
+
+
+async def slow_async(seconds: float, db: AsyncSession = Depends(get_db)):
+    await db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+    return {"ok": True}
+
+
+app.add_api_route("/_bench/slow-sync", slow_sync, methods=["GET"])
+app.add_api_route("/_bench/slow-async", slow_async, methods=["GET"])
+
+
+async def run(path: str, concurrency: int, sleep_ms: int, probes: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        params = {"seconds": sleep_ms / 1000}
+        slow = [asyncio.create_task(client.get(path, params=params)) for _ in range(concurrency)]
+
+        # Latency is measured from the moment each probe was due, so time
+        # spent waiting for a blocked event loop is included
+        latencies = []
+        interval = sleep_ms / 1000 / probes
+        origin = time.perf_counter()
+        for i in range(probes):
+            due = origin + i * interval
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/health")
+            latencies.append((time.perf_counter() - due) * 1000)
+
+        await asyncio.gather(*slow)
+    return latencies
+
+
+def report(label: str, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<14} /health p50={statistics.median(ordered):8.2f} ms "
+        f"p95={p95:8.2f} ms max={ordered[-1]:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--sleep-ms", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"📈 {args.concurrency} concurrent slow queries of {args.sleep_ms} ms ({engine.dialect.name})")
+
+    async def both():
+        before = await run("/_bench/slow-sync", args.concurrency, args.sleep_ms, args.probes)
+        after = await run("/_bench/slow-async", args.concurrency, args.sleep_ms, args.probes)
+        await async_engine.dispose()
+        return before, after
+
+    before, after = asyncio.run(both())
+    report("before (sync)", before)
+    report("after (async)", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Synthetic dataset generator for load tests and benchmarks
+
+Bulk-loads ``--users`` users with ``--projects-per-user`` projects each into
+DATABASE_URL, spread over the last ``--days`` days. Rows go in with Core
+executemany in batches of ``--batch`` (one transaction per batch, users and
+their projects together), every user shares one precomputed bcrypt hash of
+``PASSWORD``, and the dashboard counters are rebuilt once at the end.
+
+Generated users are numbered, so a rerun finds how many already exist with
+a binary search of indexed EXISTS lookups on their emails and only tops up
+the rest.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.dataset --users 1000000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import exists, insert, select, text
+
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models.project import Project
+from app.models.user import User
+
+EMAIL_DOMAIN = "load.smartadmin.com"
+PASSWORD = "password123"
+STATUSES = ("active", "active", "active", "completed", "paused")
+PRIORITIES = ("low", "medium", "medium", "high")
+WORDS = (
+    "ERP", "dashboard", "migration", "portal", "analytics", "gateway", "mobile",
+    "billing", "inventory", "reporting", "payroll", "CRM", "microservice", "legacy",
+)
+
+
+def generated_email(index: int) -> str:
+    return f"user{index}@{EMAIL_DOMAIN}"
+
+
+def _user_exists(db, index: int) -> bool:
+    return db.execute(select(exists().where(User.email == generated_email(index)))).scalar()
+
+
+def count_generated_users(db, limit: int) -> int:
+    """Generated users present, assuming batches commit in index order"""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high) // 2
+        if _user_exists(db, middle):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _fast_bulk_load(connection) -> None:
+    # Durability is not needed for a throwaway dataset
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET synchronous_commit = off"))
+    elif connection.dialect.name == "sqlite":
+        connection.execute(text("PRAGMA synchronous = OFF"))
+
+
+def migrate() -> None:
+    # The full schema as init_db.py builds it: every model, then migrations
+    # (the SQLite FTS5 table and triggers behind ?q= come from revision 0002)
+    from init_db import init_db
+    if not init_db():
+        sys.exit("❌ Could not initialise the database")
+
+
+def generate(users: int, projects_per_user: int, days: int, batch: int, seed: int = 42) -> int:
+    """Top up to ``users`` generated users; returns how many were inserted"""
+    migrate()
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    span_seconds = days * 24 * 3600
+
+    with SessionLocal() as db:
+        start = count_generated_users(db, users)
+        if start >= users:
+            return 0
+        hashed_password = get_password_hash(PASSWORD)
+        _fast_bulk_load(db.connection())
+
+        user_stmt = insert(User).returning(User.id, sort_by_parameter_order=True)
+        for batch_start in range(start, users, batch):
+            indexes = range(batch_start, min(batch_start + batch, users))
+            # Sorted so ids and signup dates grow together, like real data
+            signups = sorted(now - timedelta(seconds=rng.randrange(span_seconds)) for _ in indexes)
+            user_ids = db.execute(user_stmt, [
+                {
+                    "email": generated_email(index),
+                    "username": f"user{index}",
+                    "full_name": f"Load User {index}",
+                    "hashed_password": hashed_password,
+                    "created_at": created_at,
+                }
+                for index, created_at in zip(indexes, signups)
+            ]).scalars().all()
+
+            projects = []
+            for user_id, created_at in zip(user_ids, signups):
+                for _ in range(projects_per_user):
+                    projects.append({
+                        "name": " ".join(rng.sample(WORDS, 2)).title(),
+                        "description": " ".join(rng.sample(WORDS, 6)),
+                        "status": rng.choice(STATUSES),
+                        "priority": rng.choice(PRIORITIES),
+                        "owner_id": user_id,
+                        "created_at": created_at + timedelta(seconds=rng.randrange(max(
+                            1, int((now - created_at).total_seconds())
+                        ))),
+                    })
+            if projects:
+                db.execute(insert(Project), projects)
+            db.commit()
+            print(f"   {indexes.stop:,}/{users:,} users")
+    return users - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--projects-per-user", type=int, default=3)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"🌱 Generating up to {args.users:,} users x {args.projects_per_user} projects ({engine.dialect.name})")
+    start = time.perf_counter()
+    inserted = generate(args.users, args.projects_per_user, args.days, args.batch)
+    elapsed = time.perf_counter() - start
+    if not inserted:
+        print("✅ Dataset already generated")
+        return
+    rows = inserted * (1 + args.projects_per_user)
+    print(f"✅ Inserted {rows:,} rows in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s)")
+
+    # Counters and signup rollups were bypassed by the bulk insert
+    from reconcile_counters import reconcile_counters
+    reconcile_counters()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""Load test: every route in app.main at fixed concurrency, with a JSON baseline
+
+Drives each route registered on the app through httpx/ASGI with
+``--concurrency`` in-flight requests, ``--requests`` per route, and records
+RPS plus p50/p95/p99 latency to ``--output``. Point DATABASE_URL at a scratch
+database filled by benchmarks/dataset.py so the numbers reflect a realistic
+table size. Writes operate on scratch rows created up front and removed
+afterwards.
+
+With ``--compare`` the run is checked against an earlier baseline. The
+script exits non-zero if any route's p95 rose, or its RPS fell, by more than
+``--max-regression``.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.dataset --users 100000
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.load --output before.json
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.load --compare before.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import delete, insert, select
+
+from app.core.database import SessionLocal, async_engine, engine
+from app.core.security import get_password_hash
+from app.main import app
+from app.models.project import Project
+from app.models.user import User
+from benchmarks.dataset import migrate
+
+SCRATCH_DOMAIN = "loadtest.smartadmin.com"
+SCRATCH_PASSWORD = "loadtest123"
+BULK_SIZE = 10
+# Exports stream the whole table per request, bulk user creation runs
+# BULK_SIZE bcrypt hashes; both get fewer requests
+EXPORT_REQUESTS = 5
+BULK_HASH_REQUESTS = 20
+
+
+@dataclass
+class Context:
+    """Ids and credentials shared by the scenarios of one run"""
+    run: str
+    token: str = ""
+    # Read, updated and used as owners; never deleted
+    user_ids: List[int] = field(default_factory=list)
+    project_ids: List[int] = field(default_factory=list)
+    # Consumed by the delete routes; these users own no projects
+    disposable_user_ids: List[int] = field(default_factory=list)
+    disposable_project_ids: List[int] = field(default_factory=list)
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    def take_users(self, count: int) -> List[int]:
+        return [self.disposable_user_ids.pop() for _ in range(count)]
+
+    def take_projects(self, count: int) -> List[int]:
+        return [self.disposable_project_ids.pop() for _ in range(count)]
+
+    def email(self) -> str:
+        return f"{self.run}-{next(self.counter)}@{SCRATCH_DOMAIN}"
+
+
+@dataclass
+class Scenario:
+    # Builds httpx.request() keyword arguments for one request
+    build: Optional[Callable[[Context], dict]]
+    # Scratch users/projects consumed per request (deletes)
+    users: int = 0
+    projects: int = 0
+    requests: Optional[int] = None
+    skip: str = ""
+
+
+def _new_user(ctx: Context) -> dict:
+    email = ctx.email()
+    return {"email": email, "username": email.split("@")[0], "full_name": "Load Test", "password": SCRATCH_PASSWORD}
+
+
+def _any(ids: List[int], ctx: Context) -> int:
+    return ids[next(ctx.counter) % len(ids)]
+
+
+# (method, route path) -> scenario; every route on the app must appear here
+SCENARIOS: Dict[tuple, Scenario] = {
+    ("GET", "/"): Scenario(lambda ctx: {"url": "/"}),
+    ("GET", "/health"): Scenario(lambda ctx: {"url": "/health"}),
+    ("GET", "/health/pool"): Scenario(lambda ctx: {"url": "/health/pool"}),
+    ("GET", "/metrics"): Scenario(lambda ctx: {"url": "/metrics"}),
+    ("POST", "/api/auth/register"): Scenario(lambda ctx: {"url": "/api/auth/register", "json": _new_user(ctx)}),
+    ("POST", "/api/auth/login"): Scenario(lambda ctx: {
+        "url": "/api/auth/login",
+        "data": {"username": f"{ctx.run}-login@{SCRATCH_DOMAIN}", "password": SCRATCH_PASSWORD},
+    }),
+    ("GET", "/api/auth/me"): Scenario(lambda ctx: {
+        "url": "/api/auth/me", "headers": {"Authorization": f"Bearer {ctx.token}"},
+    }),
+    ("GET", "/api/dashboard/metrics"): Scenario(lambda ctx: {"url": "/api/dashboard/metrics"}),
+    ("GET", "/api/dashboard/user-growth"): Scenario(lambda ctx: {
+        "url": "/api/dashboard/user-growth", "params": {"bucket": "week"},
+    }),
+    ("GET", "/api/dashboard/stream"): Scenario(None, skip="long-lived SSE stream"),
+    ("GET", "/api/users/"): Scenario(lambda ctx: {"url": "/api/users/", "params": {"limit": 100}}),
+    ("GET", "/api/users/export"): Scenario(lambda ctx: {"url": "/api/users/export"}, requests=EXPORT_REQUESTS),
+    ("POST", "/api/users/bulk"): Scenario(lambda ctx: {
+        "url": "/api/users/bulk", "json": [_new_user(ctx) for _ in range(BULK_SIZE)],
+    }, requests=BULK_HASH_REQUESTS),
+    ("PUT", "/api/users/bulk"): Scenario(lambda ctx: {
+        "url": "/api/users/bulk",
+        "json": [{"id": _any(ctx.user_ids, ctx), "full_name": "Load Test Bulk"} for _ in range(BULK_SIZE)],
+    }),
+    ("POST", "/api/users/bulk/delete"): Scenario(lambda ctx: {
+        "url": "/api/users/bulk/delete", "json": [{"id": user_id} for user_id in ctx.take_users(BULK_SIZE)],
+    }, users=BULK_SIZE),
+    ("GET", "/api/users/{user_id}"): Scenario(lambda ctx: {"url": f"/api/users/{_any(ctx.user_ids, ctx)}"}),
+    ("PUT", "/api/users/{user_id}"): Scenario(lambda ctx: {
+        "url": f"/api/users/{_any(ctx.user_ids, ctx)}", "json": {"full_name": "Load Test Updated"},
+    }),
+    ("DELETE", "/api/users/{user_id}"): Scenario(
+        lambda ctx: {"url": f"/api/users/{ctx.take_users(1)[0]}"}, users=1
+    ),
+    ("GET", "/api/projects/"): Scenario(lambda ctx: {"url": "/api/projects/", "params": {"limit": 100}}),
+    ("POST", "/api/projects/"): Scenario(lambda ctx: {
+        "url": "/api/projects/",
+        "json": {"name": "Load Test", "description": ctx.run, "owner_id": _any(ctx.user_ids, ctx)},
+    }),
+    ("GET", "/api/projects/export"): Scenario(
+        lambda ctx: {"url": "/api/projects/export", "params": {"status": "paused"}}, requests=EXPORT_REQUESTS
+    ),
+    ("POST", "/api/projects/bulk"): Scenario(lambda ctx: {
+        "url": "/api/projects/bulk",
+        "json": [
+            {"name": "Load Test Bulk", "description": ctx.run, "owner_id": _any(ctx.user_ids, ctx)}
+            for _ in range(BULK_SIZE)
+        ],
+    }),
+    ("PUT", "/api/projects/bulk"): Scenario(lambda ctx: {
+        "url": "/api/projects/bulk",
+        "json": [{"id": _any(ctx.project_ids, ctx), "priority": "high"} for _ in range(BULK_SIZE)],
+    }),
+    ("POST", "/api/projects/bulk/delete"): Scenario(lambda ctx: {
+        "url": "/api/projects/bulk/delete",
+        "json": [{"id": project_id} for project_id in ctx.take_projects(BULK_SIZE)],
+    }, projects=BULK_SIZE),
+    ("GET", "/api/projects/{project_id}"): Scenario(
+        lambda ctx: {"url": f"/api/projects/{_any(ctx.project_ids, ctx)}"}
+    ),
+    ("PUT", "/api/projects/{project_id}"): Scenario(lambda ctx: {
+        "url": f"/api/projects/{_any(ctx.project_ids, ctx)}", "json": {"status": "paused"},
+    }),
+    ("DELETE", "/api/projects/{project_id}"): Scenario(
+        lambda ctx: {"url": f"/api/projects/{ctx.take_projects(1)[0]}"}, projects=1
+    ),
+}
+
+
+def app_routes() -> List[tuple]:
+    """(method, path) for every API route on the app, docs excluded"""
+    return [
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in sorted(route.methods)
+    ]
+
+
+def create_scratch_rows(ctx: Context, routes: List[tuple], requests: int) -> None:
+    """Scratch users (one of them to log in as) and projects, enough for the deletes"""
+    disposable_users = sum(SCENARIOS[route].users * requests for route in routes)
+    disposable_projects = sum(SCENARIOS[route].projects * requests for route in routes)
+    hashed_password = get_password_hash(SCRATCH_PASSWORD)
+    with SessionLocal() as db:
+        login = {"email": f"{ctx.run}-login@{SCRATCH_DOMAIN}", "username": f"{ctx.run}-login"}
+        user_ids = db.execute(insert(User).returning(User.id, sort_by_parameter_order=True), [
+            {"full_name": "Load Test", "hashed_password": hashed_password, **login},
+            *(
+                {"email": ctx.email(), "username": f"{ctx.run}-scratch-{i}",
+                 "full_name": "Load Test", "hashed_password": hashed_password}
+                for i in range(BULK_SIZE + disposable_users)
+            ),
+        ]).scalars().all()
+        ctx.user_ids = user_ids[:1 + BULK_SIZE]
+        ctx.disposable_user_ids = user_ids[1 + BULK_SIZE:]
+        project_ids = db.execute(insert(Project).returning(Project.id, sort_by_parameter_order=True), [
+            {"name": "Load Test", "description": ctx.run, "owner_id": ctx.user_ids[i % len(ctx.user_ids)]}
+            for i in range(BULK_SIZE + disposable_projects)
+        ]).scalars().all()
+        ctx.project_ids = project_ids[:BULK_SIZE]
+        ctx.disposable_project_ids = project_ids[BULK_SIZE:]
+        db.commit()
+
+
+def remove_scratch_rows(ctx: Context) -> None:
+    with SessionLocal() as db:
+        scratch_users = select(User.id).where(User.email.like(f"{ctx.run}-%@{SCRATCH_DOMAIN}"))
+        db.execute(delete(Project).where(
+            (Project.description == ctx.run) | Project.owner_id.in_(scratch_users)
+        ))
+        db.execute(delete(User).where(User.email.like(f"{ctx.run}-%@{SCRATCH_DOMAIN}")))
+        db.commit()
+    # Bypassed the counters both ways; rebuild them
+    from reconcile_counters import reconcile_counters
+    reconcile_counters()
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            kwargs = scenario.build(ctx)
+            method = kwargs.pop("method")
+            start = time.perf_counter()
+            response = await client.request(method, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+    }
+
+
+async def run(routes: List[tuple], ctx: Context, requests: int, concurrency: int) -> Dict[str, dict]:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        login = await client.post("/api/auth/login", data=SCENARIOS[("POST", "/api/auth/login")].build(ctx)["data"])
+        login.raise_for_status()
+        ctx.token = login.json()["access_token"]
+
+        for method, path in routes:
+            scenario = SCENARIOS[(method, path)]
+            label = f"{method} {path}"
+            if scenario.skip:
+                results[label] = {"skipped": scenario.skip}
+                print(f"⏭️  {label:<42} {scenario.skip}")
+                continue
+            build = scenario.build
+            with_method = Scenario(lambda ctx, build=build, method=method: {"method": method, **build(ctx)})
+            result = await run_scenario(
+                client, ctx, with_method, scenario.requests or requests, concurrency
+            )
+            results[label] = result
+            print(
+                f"{'❌' if result['errors'] else '✅'} {label:<42} {result['rps']:9.1f} req/s  "
+                f"p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms"
+                + (f"  {result['errors']} errors" if result["errors"] else "")
+            )
+    await async_engine.dispose()
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, dict], baseline_path: str, max_regression: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n📊 Against {baseline_path} ({baseline.get('commit') or 'unknown commit'})")
+    ok = True
+    for label, result in current.items():
+        before = baseline["routes"].get(label)
+        if "skipped" in result or not before or "skipped" in before:
+            continue
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        rps_change = result["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        regressed = p95_change > max_regression or rps_change < -max_regression
+        ok &= not regressed
+        print(f"{'❌' if regressed else '  '} {label:<42} p95 {p95_change:+7.1%}  rps {rps_change:+7.1%}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", default="load-baseline.json")
+    parser.add_argument("--compare", help="earlier --output file to check against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    routes = app_routes()
+    missing = [route for route in routes if route not in SCENARIOS]
+    if missing:
+        sys.exit(f"No load scenario for {missing}; add them to SCENARIOS")
+
+    migrate()
+    with SessionLocal() as db:
+        users = db.query(User.id).count()
+        projects = db.query(Project.id).count()
+    print(f"📈 {len(routes)} routes x {args.requests} requests, {args.concurrency} concurrent "
+          f"({engine.dialect.name}, {users:,} users, {projects:,} projects)")
+
+    ctx = Context(run=f"load-{uuid.uuid4().hex[:8]}")
+    create_scratch_rows(ctx, routes, args.requests)
+    try:
+        results = asyncio.run(run(routes, ctx, args.requests, args.concurrency))
+    finally:
+        remove_scratch_rows(ctx)
+
+    baseline = {
+        "commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "dialect": engine.dialect.name,
+        "users": users,
+        "projects": projects,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "routes": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(baseline, f, indent=2)
+    print(f"💾 Baseline written to {args.output}")
+
+    failed = any(result.get("errors") for result in results.values())
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Offset vs keyset pagination on a large projects table
+
+Seeds ``--rows`` projects (default one million) into the configured
+DATABASE_URL if it has fewer, then times page 1 and page ``--page`` through
+GET /api/projects/ with skip/limit and with cursors. Point DATABASE_URL at a
+scratch database:
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.pagination
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from app.core.database import SessionLocal, async_engine, engine
+from app.core.pagination import encode_cursor
+from app.main import app
+from app.models.project import Project
+from app.models.user import User
+from benchmarks.dataset import migrate
+
+CHUNK_SIZE = 10_000
+
+
+def seed_projects(rows: int):
+    migrate()
+    with SessionLocal() as db:
+        owner_id = db.execute(select(User.id).limit(1)).scalar()
+        if owner_id is None:
+            owner = User(
+                email="bench@smartadmin.com",
+                username="bench",
+                full_name="Benchmark Owner",
+                hashed_password="!",
+            )
+            db.add(owner)
+            db.commit()
+            owner_id = owner.id
+
+        existing = db.execute(select(func.count(Project.id))).scalar()
+        if existing >= rows:
+            return
+        print(f"🌱 Seeding {rows - existing:,} projects...")
+        for start in range(existing, rows, CHUNK_SIZE):
+            batch = [
+                {"name": f"Project {i}", "description": "benchmark", "owner_id": owner_id}
+                for i in range(start, min(start + CHUNK_SIZE, rows))
+            ]
+            db.execute(insert(Project), batch)
+            db.commit()
+
+
+async def time_request(client: httpx.AsyncClient, params: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get("/api/projects/", params=params)
+        response.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def run(page: int, limit: int, repeat: int):
+    # Cursor for a deep page: the id the previous page ended on
+    with SessionLocal() as db:
+        stmt = select(Project.id).order_by(Project.id).offset((page - 1) * limit - 1).limit(1)
+        deep_after_id = db.execute(stmt).scalar()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {
+            "offset page 1": await time_request(client, {"skip": 0, "limit": limit}, repeat),
+            f"offset page {page}": await time_request(
+                client, {"skip": (page - 1) * limit, "limit": limit}, repeat
+            ),
+            "cursor page 1": await time_request(client, {"cursor": "", "limit": limit}, repeat),
+            f"cursor page {page}": await time_request(
+                client, {"cursor": encode_cursor({"id": deep_after_id}), "limit": limit}, repeat
+            ),
+        }
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.page * args.limit > args.rows:
+        parser.error("--page * --limit must not exceed --rows")
+
+    seed_projects(args.rows)
+    results = asyncio.run(run(args.page, args.limit, args.repeat))
+    print(f"📈 {args.rows:,} projects, {args.limit} per page ({engine.dialect.name}), median of {args.repeat}")
+    for label, median_ms in results.items():
+        print(f"{label:<22} {median_ms:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
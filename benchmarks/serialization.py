@@ -0,0 +1,89 @@
+"""Requests per second: default list responses vs ``fast=true``
+
+Seeds ``--rows`` projects into DATABASE_URL (see benchmarks/pagination.py),
+then drives GET /api/users/ and GET /api/projects/ with ``--concurrency``
+in-flight requests for ``--seconds`` each, with and without the orjson fast
+path, and reports requests per second.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.serialization
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core.database import SessionLocal, async_engine, engine
+from app.main import app
+from app.models.user import User
+from benchmarks.pagination import seed_projects
+
+
+def seed_users(rows: int):
+    with SessionLocal() as db:
+        existing = db.query(User).count()
+        if existing >= rows:
+            return
+        db.bulk_insert_mappings(User, [
+            {
+                "email": f"bench{i}@smartadmin.com",
+                "username": f"bench{i}",
+                "full_name": f"Benchmark User {i}",
+                "hashed_password": "!",
+            }
+            for i in range(existing, rows)
+        ])
+        db.commit()
+
+
+async def requests_per_second(client: httpx.AsyncClient, path: str, params: dict, seconds: float, concurrency: int):
+    completed = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+            completed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return completed / (time.perf_counter() - start)
+
+
+async def run(limit: int, seconds: float, concurrency: int):
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/api/users/", "/api/projects/"):
+            for fast in (False, True):
+                params = {"limit": limit, "fast": fast}
+                # Warm up the pool and statement caches before measuring
+                await client.get(path, params=params)
+                results[(path, fast)] = await requests_per_second(client, path, params, seconds, concurrency)
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    seed_projects(args.rows)
+    seed_users(args.limit)
+    results = asyncio.run(run(args.limit, args.seconds, args.concurrency))
+
+    print(f"📈 {args.limit} rows per page, {args.concurrency} concurrent ({engine.dialect.name})")
+    for path in ("/api/users/", "/api/projects/"):
+        default_rps = results[(path, False)]
+        fast_rps = results[(path, True)]
+        print(f"{path:<16} default {default_rps:8.1f} req/s   fast {fast_rps:8.1f} req/s   x{fast_rps / default_rps:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Write throughput: UPDATE/DELETE ... RETURNING vs select-mutate-refresh
+
+Creates ``--rows`` scratch projects in DATABASE_URL, then runs ``--rows``
+single-row writes per case through the project handlers
+(``update_project`` / ``delete_project``) and through the previous ORM flow
+(SELECT ... FOR UPDATE, mutate, commit, refresh), reporting writes per
+second and SQL statements per write. Counter bumps and activity events are
+the same on both sides, so the difference is the round-trips saved.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.writes
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import Response
+from sqlalchemy import delete, event, insert, select
+
+from app.api.projects.router import delete_project, update_project
+from app.core.activity import activity_log
+from app.core.counters import PROJECTS_VERSION, bump_counters, project_status_counter, rebuild_counters
+from app.core.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app.models.project import Project
+from app.schemas.project import ProjectUpdate
+from benchmarks.pagination import seed_projects
+
+BENCH_DESCRIPTION = "write benchmark"
+
+statements = 0
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_statement(*args):
+    global statements
+    statements += 1
+
+
+async def orm_update(db, project_id: int, project_update: ProjectUpdate):
+    stmt = select(Project).where(Project.id == project_id).with_for_update()
+    project = (await db.execute(stmt)).scalar_one_or_none()
+    old_status = project.status
+    for field, value in project_update.model_dump(exclude_unset=True).items():
+        setattr(project, field, value)
+    deltas = {PROJECTS_VERSION: 1}
+    if project.status != old_status:
+        deltas[project_status_counter(old_status)] = -1
+        deltas[project_status_counter(project.status)] = 1
+    await bump_counters(db, deltas)
+    await db.commit()
+    await db.refresh(project)
+    activity_log.record("project.updated", "project", project.id, project.name)
+
+
+async def orm_delete(db, project_id: int):
+    stmt = select(Project).where(Project.id == project_id).with_for_update()
+    project = (await db.execute(stmt)).scalar_one_or_none()
+    await db.delete(project)
+    await bump_counters(db, {project_status_counter(project.status): -1, PROJECTS_VERSION: 1})
+    await db.commit()
+    activity_log.record("project.deleted", "project", project_id, project.name)
+
+
+async def returning_update(db, project_id: int, project_update: ProjectUpdate):
+    await update_project(project_id, project_update, Response(), if_match=None, actor=None, db=db)
+
+
+async def returning_delete(db, project_id: int):
+    await delete_project(project_id, if_match=None, actor=None, db=db)
+
+
+async def scratch_projects(rows: int) -> list:
+    async with AsyncSessionLocal() as db:
+        owner_id = (await db.execute(select(Project.owner_id).limit(1))).scalar()
+        stmt = insert(Project).returning(Project.id, sort_by_parameter_order=True)
+        ids = list((await db.execute(stmt, [
+            {"name": f"Write {i}", "description": BENCH_DESCRIPTION, "owner_id": owner_id}
+            for i in range(rows)
+        ])).scalars())
+        await db.commit()
+    return ids
+
+
+async def measure(write, ids: list, *args):
+    global statements
+    statements = 0
+    start = time.perf_counter()
+    for project_id in ids:
+        # Fresh session per write, as each request gets from get_db
+        async with AsyncSessionLocal() as db:
+            await write(db, project_id, *args)
+    elapsed = time.perf_counter() - start
+    return len(ids) / elapsed, statements / len(ids)
+
+
+async def run(rows: int):
+    cases = [
+        ("update name", orm_update, returning_update, (ProjectUpdate(name="renamed"),)),
+        ("update status", orm_update, returning_update, (ProjectUpdate(status="paused"),)),
+        ("delete", orm_delete, returning_delete, ()),
+    ]
+    results = []
+    for label, orm_write, returning_write, args in cases:
+        orm = await measure(orm_write, await scratch_projects(rows), *args)
+        returning = await measure(returning_write, await scratch_projects(rows), *args)
+        results.append((label, orm, returning))
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Project).where(Project.description == BENCH_DESCRIPTION))
+        await db.commit()
+    await async_engine.dispose()
+    # Scratch rows bypassed the status counters; recount them
+    with SessionLocal() as db:
+        rebuild_counters(db)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    seed_projects(1)
+    results = asyncio.run(run(args.rows))
+
+    print(f"📈 {args.rows:,} single-row writes per case ({engine.dialect.name})")
+    for label, (orm_wps, orm_statements), (returning_wps, returning_statements) in results:
+        print(
+            f"{label:<14} select+refresh {orm_wps:8.1f} w/s ({orm_statements:.1f} stmts)   "
+            f"returning {returning_wps:8.1f} w/s ({returning_statements:.1f} stmts)   "
+            f"x{returning_wps / orm_wps:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,5 +8,6 @@ pip install -r requirements.txt
 # Initialize database
 python init_db.py
 python seed_data.py
+python reconcile_counters.py
 
 echo "✅ Build completed successfully!"
\ No newline at end of file
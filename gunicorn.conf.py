@@ -0,0 +1,88 @@
+"""Production server profile: gunicorn managing uvicorn workers
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every knob can be overridden from the environment (WEB_CONCURRENCY, PORT,
+GUNICORN_*). Each worker has its own DB pool, so the database sees up to
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections; the default worker
+count keeps that within DB_MAX_CONNECTIONS.
+"""
+import multiprocessing
+import os
+import tempfile
+
+# Prometheus multiprocess mode must be configured before the app (and
+# prometheus_client) is imported. Stale files are cleared in on_starting:
+# gunicorn re-reads this module on HUP while workers are writing there.
+prometheus_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "smartadmin-prometheus")
+)
+os.makedirs(prometheus_dir, exist_ok=True)
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+def default_workers() -> int:
+    # Async workers: one per core is enough to saturate the CPU. cpu_count()
+    # is the host's inside a container, so the DB connection budget caps it
+    from app.core.config import settings
+
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = multiprocessing.cpu_count()
+    per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return max(min(cpus, settings.DB_MAX_CONNECTIONS // per_worker), 1)
+
+# Render and similar hosts set WEB_CONCURRENCY from the instance size
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers()))
+
+# Import app.main once in the master; workers fork with it already loaded
+preload_app = True
+
+# Recycle workers gradually (jitter avoids restarting all at once)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+
+# Longer than typical load balancer idle timeouts (60 s) so the proxy, not
+# the worker, closes idle connections and never reuses a closed one
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 65))
+
+accesslog = "-"
+errorlog = "-"
+
+def reset_prometheus_dir():
+    # Drop files left by a previous boot's processes; the preloaded master's
+    # own files are already open, so they stay
+    own = f"_{os.getpid()}.db"
+    for name in os.listdir(prometheus_dir):
+        if not name.endswith(own):
+            os.remove(os.path.join(prometheus_dir, name))
+
+def on_starting(server):
+    reset_prometheus_dir()
+
+    # DB init/seed once, in the master, before any worker exists
+    if os.getenv("RENDER"):
+        from app.core.bootstrap import BOOTSTRAPPED_ENV, bootstrap_database
+        from app.core.database import engine
+
+        server.log.info("Bootstrapping database in the master process")
+        if bootstrap_database():
+            os.environ[BOOTSTRAPPED_ENV] = "1"
+        # Connections must not be shared with forked workers
+        engine.dispose()
+
+def post_fork(server, worker):
+    # Drop any pool state inherited from the master without closing its sockets
+    from app.core.database import async_engine, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+def child_exit(server, worker):
+    from app.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
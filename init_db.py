@@ -3,6 +3,9 @@ from sqlalchemy import text
 from app.core.database import engine, Base, SessionLocal
 from app.models.user import User
 from app.models.project import Project
+from app.models.dashboard_counter import DashboardCounter
+from app.models.user_signup_rollup import UserSignupRollup
+from app.models.activity import Activity
 def init_db():
     """Initialize database tables for modern SQLAlchemy"""
     try:
@@ -17,6 +20,12 @@ def init_db():
         Base.metadata.create_all(bind=engine)
         print("✅ Database tables created successfully!")
         
+        # Apply migrations for databases created before the current models
+        from alembic import command
+        from alembic.config import Config
+        command.upgrade(Config("alembic.ini"), "head")
+        print("✅ Database migrations applied!")
+        
         # Check if tables exist and have data
         with SessionLocal() as db:
             from sqlalchemy import select, func
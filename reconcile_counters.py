@@ -0,0 +1,36 @@
+import sys
+from sqlalchemy import delete
+from app.core.counters import rebuild_counters
+from app.core.database import SessionLocal
+from app.models.user_signup_rollup import UserSignupRollup
+
+def reconcile_counters():
+    """Rebuild dashboard aggregates from users/projects and report drift"""
+    try:
+        print("🔢 Reconciling dashboard counters...")
+        with SessionLocal() as db:
+            drift = rebuild_counters(db)
+        
+        if drift:
+            for name, (stored, actual) in sorted(drift.items()):
+                print(f"⚠️  Drift in '{name}': stored={stored} actual={actual}")
+        else:
+            print("✅ Counters were in sync")
+        
+        print("✅ Dashboard counters rebuilt!")
+        
+        # Signup rollups are recomputed lazily on the next user-growth read
+        with SessionLocal() as db:
+            db.execute(delete(UserSignupRollup))
+            db.commit()
+        print("✅ User growth rollups cleared!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error reconciling counters: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = reconcile_counters()
+    if not success:
+        sys.exit(1)
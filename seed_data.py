@@ -1,5 +1,5 @@
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select
 from app.core.database import SessionLocal
 from app.models.user import User
 from app.models.project import Project
@@ -10,26 +10,24 @@ def seed_data():
     
     try:
         with SessionLocal() as db:
-            # Check if data already exists (SQLAlchemy 2.0 style)
-            stmt = select(User)
-            existing_users = len(db.execute(stmt).scalars().all())
-            
-            if existing_users > 0:
-                print(f"⚠️  Database already has {existing_users} users. Skipping seed.")
+            # EXISTS stops at the first row instead of loading every user
+            if db.execute(select(exists().where(User.id.is_not(None)))).scalar():
+                print("⚠️  Database already has users. Skipping seed.")
                 return True
             
             print("🌱 Seeding database with sample data...")
             
+            # bcrypt is deliberately slow: hash each distinct password once
+            sample_password_hash = get_password_hash("password123")
+            
             # Create admin user
-            admin_user = User(
-                email="admin@smartadmin.com",
-                username="admin",
-                full_name="Administrator",
-                hashed_password=get_password_hash("admin123"),
-                is_admin=True
-            )
-            db.add(admin_user)
-            db.flush()  # Get ID without committing
+            admin_id = db.execute(insert(User).returning(User.id), {
+                "email": "admin@smartadmin.com",
+                "username": "admin",
+                "full_name": "Administrator",
+                "hashed_password": get_password_hash("admin123"),
+                "is_admin": True
+            }).scalar_one()
             
             # Create sample users
             users_data = [
@@ -37,32 +35,29 @@ def seed_data():
                     "email": "rafael.garcia@example.com",
                     "username": "rafael",
                     "full_name": "Rafael García - Tech Lead Guadalajara",
-                    "hashed_password": get_password_hash("password123")
+                    "hashed_password": sample_password_hash
                 },
                 {
                     "email": "ana.lopez@example.com",
                     "username": "ana",
                     "full_name": "Ana López - Frontend Developer",
-                    "hashed_password": get_password_hash("password123")
+                    "hashed_password": sample_password_hash
                 },
                 {
                     "email": "carlos.ruiz@example.com",
                     "username": "carlos",
                     "full_name": "Carlos Ruiz - Backend Developer",
-                    "hashed_password": get_password_hash("password123")
+                    "hashed_password": sample_password_hash
                 },
                 {
                     "email": "maria.gonzalez@example.com",
                     "username": "maria",
                     "full_name": "María González - UX Designer",
-                    "hashed_password": get_password_hash("password123")
+                    "hashed_password": sample_password_hash
                 }
             ]
             
-            for user_data in users_data:
-                user = User(**user_data)
-                db.add(user)
-            
+            db.execute(insert(User), users_data)
             db.commit()
             print("✅ Users created successfully!")
             
@@ -73,49 +68,46 @@ def seed_data():
                     "description": "Sistema ERP especializado en contaduría gubernamental desarrollado en Guadalajara con metodologías Agile",
                     "status": "active",
                     "priority": "high",
-                    "owner_id": admin_user.id
+                    "owner_id": admin_id
                 },
                 {
                     "name": "SmartAdmin Dashboard",
                     "description": "Panel de métricas y analytics en tiempo real con FastAPI + React + PostgreSQL",
                     "status": "active",
                     "priority": "high",
-                    "owner_id": admin_user.id
+                    "owner_id": admin_id
                 },
                 {
                     "name": "Mobile App Flutter",
                     "description": "Aplicación móvil para gestión de tareas administrativas con Flutter",
                     "status": "completed",
                     "priority": "medium",
-                    "owner_id": admin_user.id
+                    "owner_id": admin_id
                 },
                 {
                     "name": "API Gateway Microservice",
                     "description": "Microservicio para gestión centralizada de APIs con Docker y CI/CD",
                     "status": "active",
                     "priority": "medium",
-                    "owner_id": admin_user.id
+                    "owner_id": admin_id
                 },
                 {
                     "name": "Tech Lead Portfolio",
                     "description": "Proyecto showcase para demostrar habilidades de liderazgo técnico y stack moderno",
                     "status": "active",
                     "priority": "high",
-                    "owner_id": admin_user.id
+                    "owner_id": admin_id
                 },
                 {
                     "name": "Legacy System Migration",
                     "description": "Migración de sistema legacy en VB.NET a arquitectura moderna con microservicios",
                     "status": "paused",
                     "priority": "low",
-                    "owner_id": admin_user.id
+                    "owner_id": admin_id
                 }
             ]
             
-            for project_data in projects_data:
-                project = Project(**project_data)
-                db.add(project)
-            
+            db.execute(insert(Project), projects_data)
             db.commit()
             print("✅ Projects created successfully!")
             print(f"🎉 Sample data seeded successfully!")
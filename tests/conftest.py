@@ -0,0 +1,61 @@
+"""Shared fixtures: every test runs against a throwaway SQLite database
+
+The app builds its engines from DATABASE_URL when app.core.database is
+first imported, so the URL is pointed at a temporary file here, before any
+test module imports the app. Nothing ever touches the configured database.
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+DATABASE_DIR = tempfile.mkdtemp(prefix="smartadmin-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_DIR}/test.db"
+os.environ.pop("RENDER", None)
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    return config
+
+
+def migrate(engine):
+    """Same schema path as init_db.py: models first, then migrations"""
+    from alembic import command
+    from app.core.database import Base
+
+    Base.metadata.create_all(bind=engine)
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="session")
+def app_database():
+    """The app's own database (DATABASE_URL above), migrated to head"""
+    from app.core.database import engine
+
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client(app_database):
+    """One TestClient (and so one event loop for the async engine) per session"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,66 @@
+"""Per-worker token cache: cross-worker staleness and per-user invalidation"""
+import time
+
+import pytest
+from sqlalchemy import delete, insert, update
+
+from app.api.deps import token_cache
+from app.core.cache import LRUCache
+from app.core.counters import USERS_VERSION, counter_snapshots
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models.dashboard_counter import DashboardCounter
+from app.models.user import User
+
+EMAIL = "cached@smartadmin.com"
+
+
+@pytest.fixture
+def token(app_database):
+    with SessionLocal() as db:
+        user_id = db.execute(insert(User).returning(User.id), {
+            "email": EMAIL, "username": "cached", "full_name": "Cached User", "hashed_password": "!",
+        }).scalar()
+        db.commit()
+
+    yield create_access_token(EMAIL)
+
+    token_cache.clear()
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+
+
+def deactivate_elsewhere():
+    """What another worker's PUT does: its own cache is the only one it clears"""
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.email == EMAIL).values(is_active=False))
+        bumped = db.execute(
+            update(DashboardCounter).where(DashboardCounter.name == USERS_VERSION)
+            .values(value=DashboardCounter.value + 1)
+        )
+        if not bumped.rowcount:
+            db.execute(insert(DashboardCounter).values(name=USERS_VERSION, value=1))
+        db.commit()
+
+
+def test_cached_token_sees_writes_from_other_workers(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    deactivate_elsewhere()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200  # within the snapshot TTL
+    counter_snapshots.invalidate()  # the snapshot TTL has passed
+    assert client.get("/api/auth/me", headers=headers).status_code == 400
+
+
+def test_invalidate_tag_drops_only_that_users_tokens():
+    cache = LRUCache(maxsize=3)
+    expires_at = time.time() + 60
+    for key, user_id in (("a", 1), ("b", 1), ("c", 2), ("d", 2)):
+        cache.set(key, user_id, expires_at, tag=user_id)
+
+    # "a" was evicted, so only "b" is left for user 1
+    assert cache.invalidate_tag(1) == 1
+    assert (cache.get("b"), cache.get("c"), cache.get("d")) == (None, 2, 2)
+    assert cache.invalidate_tag(1) == 0
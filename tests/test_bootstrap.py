@@ -0,0 +1,9 @@
+"""Startup bootstrap: the fast-path marker tracks the Alembic head"""
+from alembic.script import ScriptDirectory
+
+from app.core.bootstrap import SCHEMA_REVISION
+from conftest import alembic_config
+
+
+def test_schema_revision_is_the_alembic_head():
+    assert SCHEMA_REVISION == ScriptDirectory.from_config(alembic_config()).get_current_head()
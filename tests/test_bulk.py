@@ -0,0 +1,67 @@
+"""Bulk endpoints: request limits and chunk-by-chunk password hashing"""
+import json
+
+import pytest
+from sqlalchemy import delete
+
+from app.core import security
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+
+EMAIL_DOMAIN = "bulk.smartadmin.com"
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Records each hash and the users stored before it was computed"""
+    calls = []
+
+    async def fake_hash(password: str) -> str:
+        with SessionLocal() as db:
+            stored = db.query(User).filter(User.email.endswith(EMAIL_DOMAIN)).count()
+        calls.append(stored)
+        return "!" + password
+
+    monkeypatch.setattr(security, "get_password_hash_async", fake_hash)
+    yield calls
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.email.endswith(EMAIL_DOMAIN)))
+        db.commit()
+
+
+def new_user(i: int) -> dict:
+    return {
+        "email": f"user{i}@{EMAIL_DOMAIN}", "username": f"bulk{i}",
+        "full_name": f"Bulk {i}", "password": "password123",
+    }
+
+
+def test_each_chunk_is_stored_before_the_next_is_hashed(client, hashed, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 2)
+    # The duplicate fails its chunk, which is replayed without hashing again
+    body = [new_user(0), new_user(1), new_user(2), new_user(2), new_user(4)]
+
+    result = client.post("/api/users/bulk", json=body).json()
+
+    assert (result["succeeded"], result["failed"]) == (4, 1)
+    assert hashed == [0, 0, 2, 2, 3]
+
+
+def test_too_many_items_is_413(client, hashed, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+
+    assert client.post("/api/users/bulk", json=[new_user(i) for i in range(3)]).status_code == 413
+    ndjson = "\n".join(json.dumps(new_user(i)) for i in range(3))
+    response = client.post(
+        "/api/users/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 413
+    assert hashed == []
+
+
+def test_oversized_body_is_413(client, hashed, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_BODY_BYTES", 100)
+
+    assert client.post("/api/users/bulk", json=[new_user(0), new_user(1)]).status_code == 413
+    assert hashed == []
@@ -0,0 +1,53 @@
+"""Per-resource ETags: detail GETs emit them, If-None-Match and If-Match take them back"""
+import pytest
+from sqlalchemy import delete, insert
+
+from app.core.database import SessionLocal
+from app.models.project import Project
+from app.models.user import User
+
+
+@pytest.fixture
+def project_id():
+    with SessionLocal() as db:
+        owner_id = db.execute(insert(User).returning(User.id), {
+            "email": "etag@smartadmin.com", "username": "etag", "full_name": "ETag Owner",
+            "hashed_password": "!",
+        }).scalar()
+        project_id = db.execute(insert(Project).returning(Project.id), {
+            "name": "ETag", "description": "conditional requests", "owner_id": owner_id,
+        }).scalar()
+        db.commit()
+
+    yield project_id
+
+    with SessionLocal() as db:
+        db.execute(delete(Project).where(Project.id == project_id))
+        db.execute(delete(User).where(User.id == owner_id))
+        db.commit()
+
+
+def test_detail_etag_revalidates(client, project_id):
+    etag = client.get(f"/api/projects/{project_id}").headers["etag"]
+
+    assert client.get(f"/api/projects/{project_id}", headers={"If-None-Match": etag}).status_code == 304
+    client.put(f"/api/projects/{project_id}", json={"name": "Renamed"})
+    assert client.get(f"/api/projects/{project_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.parametrize("params", [{}, {"fields": "name"}, {"include": "owner"}])
+def test_if_match_accepts_the_detail_etag(client, project_id, params):
+    etag = client.get(f"/api/projects/{project_id}", params=params).headers["etag"]
+    assert etag.startswith('W/"')
+
+    updated = client.put(f"/api/projects/{project_id}", json={"name": "First"}, headers={"If-Match": etag})
+    assert updated.status_code == 200, updated.text
+    assert updated.headers["etag"] == client.get(f"/api/projects/{project_id}").headers["etag"]
+
+    stale = client.put(f"/api/projects/{project_id}", json={"name": "Second"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+
+
+def test_if_match_rejects_foreign_tags(client, project_id):
+    response = client.put(f"/api/projects/{project_id}", json={"name": "X"}, headers={"If-Match": 'W/"abc123"'})
+    assert response.status_code == 400
@@ -0,0 +1,94 @@
+"""Query-count regression tests for ?include= eager loading
+
+Requests projects with include=owner and users with include=projects at two
+page sizes, reads the statement count from the Server-Timing header, and
+fails if a request exceeds its budget or if the count grows with the page
+size (an N+1 lazy load). Every owner has projects of their own, so a lazy
+load shows up as one extra query per row. Dashboard polls within the cache
+TTL must not query at all.
+"""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.project import Project
+from app.models.user import User
+
+QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+PAGE_SIZES = (10, 100)
+OWNERS = max(PAGE_SIZES)
+PROJECTS_PER_OWNER = 2
+
+# (path, params, budget) - every request also reads its ETag version row
+CASES = [
+    ("/api/projects/", {"include": "owner"}, 2),
+    ("/api/projects/", {"include": "owner", "cursor": ""}, 2),
+    ("/api/projects/{project_id}", {"include": "owner"}, 2),
+    ("/api/users/", {"include": "projects"}, 3),
+    ("/api/users/", {"include": "projects", "cursor": ""}, 3),
+    ("/api/users/{user_id}", {"include": "projects"}, 3),
+]
+
+
+@pytest.fixture(scope="module")
+def ids(app_database):
+    with SessionLocal() as db:
+        user_ids = db.execute(insert(User).returning(User.id, sort_by_parameter_order=True), [
+            {
+                "email": f"owner{i}@smartadmin.com",
+                "username": f"owner{i}",
+                "full_name": f"Owner {i}",
+                "hashed_password": "!",
+            }
+            for i in range(OWNERS)
+        ]).scalars().all()
+        # Interleaved so every page of projects spans many owners
+        project_ids = db.execute(insert(Project).returning(Project.id, sort_by_parameter_order=True), [
+            {"name": f"Project {n}-{user_id}", "description": "query counts", "owner_id": user_id}
+            for n in range(PROJECTS_PER_OWNER)
+            for user_id in user_ids
+        ]).scalars().all()
+        db.commit()
+
+    yield {"user_id": user_ids[0], "project_id": project_ids[0]}
+
+    with SessionLocal() as db:
+        db.execute(delete(Project).where(Project.id.in_(project_ids)))
+        db.execute(delete(User).where(User.id.in_(user_ids)))
+        db.commit()
+
+
+@pytest.fixture(scope="module")
+def timed_client(client, ids):
+    enabled, settings.SERVER_TIMING_ENABLED = settings.SERVER_TIMING_ENABLED, True
+    yield client
+    settings.SERVER_TIMING_ENABLED = enabled
+
+
+def count_queries(client: TestClient, path: str, params: dict) -> int:
+    response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return int(QUERIES.search(response.headers["server-timing"]).group(1))
+
+
+@pytest.mark.parametrize("path, params, budget", CASES, ids=[f"{path} {params}" for path, params, _ in CASES])
+def test_include_query_count(timed_client, ids, path, params, budget):
+    url = path.format(**ids)
+    counts = {limit: count_queries(timed_client, url, {**params, "limit": limit}) for limit in PAGE_SIZES}
+
+    assert max(counts.values()) <= budget, counts
+    assert len(set(counts.values())) == 1, f"query count grows with the page size: {counts}"
+
+
+def test_dashboard_poll_within_ttl_issues_no_query(timed_client):
+    first = timed_client.get("/api/dashboard/metrics")
+    assert first.status_code == 200, first.text
+
+    assert count_queries(timed_client, "/api/dashboard/metrics", {}) == 0
+    not_modified = timed_client.get("/api/dashboard/metrics", headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert QUERIES.search(not_modified.headers["server-timing"]).group(1) == "0"
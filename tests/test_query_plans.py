@@ -0,0 +1,116 @@
+"""Query-plan regression tests for the statements the routers build
+
+Each case builds its statement with the routers' own helpers
+(``project_filters``, ``project_order_by``, ``user_page_statement``) and
+EXPLAINs it against the tests' throwaway SQLite database (see conftest.py),
+migrated the same way as init_db.py. The same cases run
+against Postgres when TEST_DATABASE_URL points at a throwaway database; there
+enable_seqscan is switched off so a seq scan only shows up when no usable
+index exists, independent of table size.
+
+Cases marked ``sorted_by_index`` must also return rows in index order, with
+no separate sort step (SQLite's temp B-tree, Postgres' Sort node).
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.api.projects.router import project_filters, project_order_by
+from app.api.users.router import user_page_statement
+from app.core.database import get_sync_database_url
+from app.models.project import Project
+from app.models.user import User
+from conftest import migrate
+
+CREATED_FROM = datetime(2026, 1, 1, tzinfo=timezone.utc)
+CREATED_TO = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def project_list(dialect_name, sort="id", **filters):
+    # GET /api/projects/ without a cursor
+    conditions = project_filters(dialect_name, **filters)
+    return select(Project).where(*conditions).order_by(*project_order_by(sort)).offset(0).limit(100)
+
+
+# (name, build(dialect_name) -> statement, sorted_by_index)
+CASES = [
+    ("auth: user by email", lambda d: select(User).where(User.email == "admin@smartadmin.com"), False),
+    ("users: user by id", lambda d: select(User).where(User.id == 1), False),
+    ("users: keyset page", lambda d: user_page_statement([User], [], 100, 101), True),
+    ("projects: project by id", lambda d: select(Project).where(Project.id == 1), False),
+    ("projects: by status", lambda d: project_list(d, status="active"), True),
+    ("projects: by owner, newest first", lambda d: project_list(d, "-created_at", owner_id=1), True),
+    ("projects: created range", lambda d: project_list(d, created_from=CREATED_FROM, created_to=CREATED_TO), False),
+    ("projects: created since, oldest first", lambda d: project_list(d, "created_at", created_from=CREATED_FROM), True),
+    ("projects: sort=created_at", lambda d: project_list(d, "created_at"), True),
+    ("projects: sort=-created_at", lambda d: project_list(d, "-created_at"), True),
+    ("projects: sort=name", lambda d: project_list(d, "name"), True),
+    ("projects: sort=-name", lambda d: project_list(d, "-name"), True),
+    ("projects: free-text search", lambda d: project_list(d, q="erp dashboard"), False),
+]
+
+
+@pytest.fixture(scope="module")
+def postgres_engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(get_sync_database_url(url))
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def explain(connection, stmt):
+    compiled = stmt.compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return list(_postgres_nodes(plan[0]["Plan"]))
+
+    sql = "EXPLAIN QUERY PLAN " + str(compiled)
+    return [row[-1] for row in connection.exec_driver_sql(sql, params).all()]
+
+
+def _postgres_nodes(node):
+    yield f"{node['Node Type']} {node.get('Relation Name', '')}".strip()
+    for child in node.get("Plans", []):
+        yield from _postgres_nodes(child)
+
+
+def _is_sequential(step: str) -> bool:
+    # SQLite: "SCAN projects" (full table); Postgres: "Seq Scan projects"
+    return step.startswith("Seq Scan") or (step.startswith("SCAN ") and "INDEX" not in step)
+
+
+def _is_sort(step: str) -> bool:
+    return step.startswith("USE TEMP B-TREE FOR ORDER BY") or step in ("Sort", "Incremental Sort")
+
+
+def assert_plan(engine, build, sorted_by_index):
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+        steps = explain(connection, build(connection.dialect.name))
+
+    assert not [step for step in steps if _is_sequential(step)], " | ".join(steps)
+    if sorted_by_index:
+        assert not [step for step in steps if _is_sort(step)], " | ".join(steps)
+
+
+@pytest.mark.parametrize("build, sorted_by_index", [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_sqlite_plan_uses_index(app_database, build, sorted_by_index):
+    assert_plan(app_database, build, sorted_by_index)
+
+
+@pytest.mark.parametrize("build, sorted_by_index", [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_postgres_plan_uses_index(postgres_engine, build, sorted_by_index):
+    assert_plan(postgres_engine, build, sorted_by_index)
@@ -0,0 +1,24 @@
+"""The orjson fast path must encode exactly like the response_model path"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.serialization import fast_json_response, model_json_response
+from app.schemas.user import User as UserSchema
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2026, 1, 1, tzinfo=timezone.utc),
+    datetime(2026, 1, 1, 12, 30, 0, 123456, tzinfo=timezone.utc),
+    datetime(2026, 1, 1, tzinfo=timezone(timedelta(hours=-5))),
+    datetime(2026, 1, 1),
+])
+def test_fast_json_matches_response_model(created_at):
+    values = {
+        "id": 1, "email": "admin@smartadmin.com", "username": "admin", "full_name": "Admin",
+        "is_active": True, "is_admin": True, "created_at": created_at, "updated_at": None,
+    }
+    # Same column order as schema_columns selects them
+    user = {name: values[name] for name in UserSchema.model_fields}
+
+    assert fast_json_response(user).body == model_json_response(UserSchema, user).body
@@ -0,0 +1,40 @@
+"""Engine timing hooks: slow-query log contents and start-time bookkeeping"""
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.timing import instrument_engine
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_slow_query_log_masks_sensitive_parameters(engine, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_PARAM_MAX_LENGTH", 10)
+    params = {"email": "a@b.io", "hashed_password": "$2b$12$secret", "password": "hunter2", "bio": "x" * 11}
+    with caplog.at_level(logging.WARNING, logger="smartadmin.sql"), engine.connect() as connection:
+        connection.execute(text("SELECT :email, :hashed_password, :password, :bio"), params)
+        connection.exec_driver_sql("SELECT ?, ?", ("short", "y" * 11))
+
+    assert "SELECT ?, ?, ?, ? {'email': 'a@b.io', 'hashed_password': '***', 'password': '***', 'bio': '*** (11 long)'}" in caplog.text
+    assert "SELECT ?, ? ('short', '*** (11 long)')" in caplog.text
+    assert "secret" not in caplog.text and "hunter2" not in caplog.text
+
+
+def test_failed_statement_clears_its_start_time(engine):
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info["query_start_time"] == []
+
+        connection.execute(text("SELECT 1"))
+        assert connection.info["query_start_time"] == []